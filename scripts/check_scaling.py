@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Check that the build pipeline scales linearly with the corpus size.
+
+Generates synthetic corpora (by default 1k, 10k and 100k phrases, in nested
+categories) and runs validate.py, generate_anki.py and generate_site.py on
+each, as separate processes, exactly as they ship. Every run must succeed
+within the wall-time and peak-memory ceilings.
+
+The cost of a run on an empty corpus is measured first and subtracted, so
+interpreter startup does not hide the growth curve. Each stage runs
+``--repeat`` times per size and the best run counts, which filters out
+noise from other processes. A power law is then fitted to each stage's time
+and memory against the number of phrases; the check fails if either grows
+faster than ``--max-exponent`` (1.0 is linear).
+
+The fit is only reliable with sizes far apart, such as the default 1k, 10k
+and 100k. On small sizes or shared machines, use ``--ceilings-only`` to
+report the exponents without failing on them.
+
+Needs a POSIX system, for per-process peak memory.
+"""
+
+import argparse
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from import_phrases import format_phrase_file
+
+SCRIPTS_DIR = Path(__file__).parent
+
+PHRASES_PER_FILE = 100
+PHRASES_PER_CATEGORY = 1000
+SUBCATEGORIES_PER_GROUP = 10
+TAGS = [f"tag-{i:02d}" for i in range(60)]
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+WORDS = ["mind", "the", "gap", "give", "way", "out", "no", "stopping", "dry", "aged", "all", "in"]
+ZH_WORDS = ["小心", "空隙", "让行", "出口", "禁止", "停车", "干式", "熟成", "全包"]
+
+# Marginal cost floors, so stages that barely grow fit a flat line
+# instead of the log of measurement noise.
+MIN_SECONDS = 0.05
+MIN_RSS_MB = 1.0
+
+
+def stage_commands(phrases_dir: Path, work_dir: Path) -> dict[str, list[str]]:
+    """Return the command line of each pipeline stage."""
+    media_dir = work_dir / "media"
+    return {
+        "validate": [
+            str(SCRIPTS_DIR / "validate.py"),
+            "--phrases-dir", str(phrases_dir),
+            "--media-dir", str(media_dir),
+        ],
+        "anki": [
+            str(SCRIPTS_DIR / "generate_anki.py"),
+            "--phrases-dir", str(phrases_dir),
+            "--media-dir", str(media_dir),
+            "--output", str(work_dir / "output" / "everyday-english.apkg"),
+        ],
+        "site": [
+            str(SCRIPTS_DIR / "generate_site.py"),
+            "--phrases-dir", str(phrases_dir),
+            "--media-dir", str(media_dir),
+            "--docs-dir", str(work_dir / "docs"),
+            "--index", str(work_dir / "site-index.json"),
+        ],
+    }
+
+
+def write_category(category_dir: Path, name: str, order: int) -> None:
+    """Write a category's _category.yaml."""
+    category_dir.mkdir(parents=True, exist_ok=True)
+    with open(category_dir / "_category.yaml", "w", encoding="utf-8") as f:
+        f.write(
+            f'name:\n  en: "{name}"\n  zh: "分类 {order}"\n\n'
+            f'description:\n  en: "Synthetic phrases: {name}"\n  zh: "合成短语"\n\n'
+            f'icon: "📁"\norder: {order}\n'
+        )
+
+
+def make_phrase(number: int, rng: random.Random) -> dict:
+    """Build a valid phrase entry with varied text lengths and tags."""
+    words = rng.choices(WORDS, k=rng.randint(2, 5))
+    text = " ".join(words)
+    meaning_zh = "".join(rng.choices(ZH_WORDS, k=rng.randint(2, 6)))
+    return {
+        "id": f"phrase-{number:06d}",
+        "phrase": text,
+        "meaning": {"en": f"Meaning of {text} ({number})", "zh": f"{meaning_zh}（{number}）"},
+        "context": {"en": f"Seen on a sign: {text}", "zh": f"在标识上看到：{meaning_zh}"},
+        "examples": [
+            {"en": f"Please {text}.", "zh": f"请{meaning_zh}。"}
+            for _ in range(rng.randint(1, 3))
+        ],
+        "difficulty": rng.choice(DIFFICULTIES),
+        "tags": rng.sample(TAGS, rng.randint(1, 4)),
+    }
+
+
+def generate_corpus(phrases_dir: Path, size: int, seed: int = 0) -> None:
+    """Write a corpus of ``size`` phrases.
+
+    Phrases go into subcategories of at most PHRASES_PER_CATEGORY phrases,
+    grouped SUBCATEGORIES_PER_GROUP to a top-level category, in files of
+    PHRASES_PER_FILE phrases. The same size and seed give the same corpus.
+    """
+    rng = random.Random(seed)
+    metadata = {"source": "check_scaling.py", "date_added": "2024-01-01"}
+    phrases_dir.mkdir(parents=True)
+
+    category_count = max(1, math.ceil(size / PHRASES_PER_CATEGORY))
+    number = 0
+
+    for category in range(category_count):
+        group, topic = divmod(category, SUBCATEGORIES_PER_GROUP)
+        group_dir = phrases_dir / f"group-{group:03d}"
+        if topic == 0:
+            write_category(group_dir, f"Group {group}", group)
+
+        category_dir = group_dir / f"topic-{topic:02d}"
+        write_category(category_dir, f"Topic {group}.{topic}", topic)
+
+        in_category = min(PHRASES_PER_CATEGORY, size - number)
+        for file_number in range(math.ceil(in_category / PHRASES_PER_FILE)):
+            count = min(PHRASES_PER_FILE, size - number)
+            phrases = [make_phrase(number + i, rng) for i in range(count)]
+            number += count
+            with open(category_dir / f"phrases-{file_number:03d}.yaml", "w", encoding="utf-8") as f:
+                f.write(format_phrase_file(metadata, phrases))
+
+
+def run_stage(command: list[str], timeout: float) -> tuple[int, float, float]:
+    """Run a stage in a fresh interpreter.
+
+    Returns (exit status, wall time in seconds, peak RSS in MB). The peak
+    RSS comes from the child's own resource usage, so runs do not mix.
+    """
+    # Errors go to a file: the child is polled, so a full pipe would block it.
+    with tempfile.TemporaryFile() as error_file:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, *command, "--quiet"],
+            stdout=subprocess.DEVNULL,
+            stderr=error_file,
+        )
+        deadline = start + timeout
+
+        while True:
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() > deadline:
+                process.kill()
+                pid, status, usage = os.wait4(process.pid, 0)
+                break
+            time.sleep(0.01)
+
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        error_file.seek(0)
+        errors = error_file.read().decode("utf-8", "replace").strip()
+
+    if errors:
+        print("    " + errors.replace("\n", "\n    "))
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return process.returncode, wall, rss_mb
+
+
+def best_run(command: list[str], timeout: float, repeat: int) -> tuple[int, float, float]:
+    """Run a stage up to ``repeat`` times; return the status and the best time and memory.
+
+    Stops at the first failing run, since a failing stage has nothing to measure.
+    """
+    best_wall = best_rss = math.inf
+    for _ in range(repeat):
+        status, wall, rss = run_stage(command, timeout)
+        best_wall, best_rss = min(best_wall, wall), min(best_rss, rss)
+        if status != 0:
+            break
+    return status, best_wall, best_rss
+
+
+def growth_exponent(sizes: list[int], values: list[float]) -> float:
+    """Least-squares slope of log(value) against log(size).
+
+    A cost proportional to size**k has slope k: 1.0 is linear, 2.0 quadratic.
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(value) for value in values]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def parse_sizes(value: str) -> list[int]:
+    """Parse a comma-separated list of corpus sizes, accepting 10k style."""
+    sizes = []
+    for item in value.split(","):
+        item = item.strip().lower()
+        multiplier = 1000 if item.endswith("k") else 1
+        try:
+            size = int(item.rstrip("k")) * multiplier
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid size: {item}")
+        if size < 1:
+            raise argparse.ArgumentTypeError(f"size must be positive: {item}")
+        sizes.append(size)
+    return sorted(set(sizes))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes",
+        type=parse_sizes,
+        default=[1000, 10000, 100000],
+        help="comma-separated corpus sizes in phrases (default: 1k,10k,100k)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=300.0,
+        help="wall-time ceiling for any single stage run",
+    )
+    parser.add_argument(
+        "--max-rss",
+        type=float,
+        default=2048.0,
+        help="peak memory ceiling in MB for any single stage run",
+    )
+    parser.add_argument(
+        "--max-exponent",
+        type=float,
+        default=1.25,
+        help="fail if time or memory grows faster than size**EXPONENT",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        help="keep the generated corpora and outputs here instead of a temporary directory",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="runs per stage and size; the best one counts (default: 3)",
+    )
+    parser.add_argument(
+        "--ceilings-only",
+        action="store_true",
+        help="only enforce the time and memory ceilings; report growth without failing on it",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic corpora")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    if not hasattr(os, "wait4"):
+        print("ERROR: The scaling check needs a POSIX system")
+        return 1
+
+    if args.work_dir is not None:
+        if args.work_dir.exists() and any(args.work_dir.iterdir()):
+            print(f"ERROR: Work directory is not empty: {args.work_dir}")
+            return 1
+        work_root = args.work_dir
+        work_root.mkdir(parents=True, exist_ok=True)
+    else:
+        work_root = Path(tempfile.mkdtemp(prefix="phrases-scaling-"))
+
+    failures = 0
+    # Stage name -> [(size, marginal seconds, marginal MB)]
+    results: dict[str, list[tuple[int, float, float]]] = {}
+
+    try:
+        for size in [0, *args.sizes]:
+            work_dir = work_root / f"corpus-{size}"
+            phrases_dir = work_dir / "phrases"
+
+            start = time.perf_counter()
+            if size:
+                generate_corpus(phrases_dir, size, args.seed)
+            else:
+                write_category(phrases_dir / "empty", "Empty", 1)
+            print(f"{size} phrases (generated in {time.perf_counter() - start:.1f}s)")
+
+            for stage, command in stage_commands(phrases_dir, work_dir).items():
+                status, wall, rss = best_run(command, args.max_seconds, args.repeat)
+                print(f"  {stage}: {wall:.2f}s, {rss:.0f} MB peak")
+
+                if status != 0:
+                    print(f"  ERROR: {stage} exited with status {status}")
+                    failures += 1
+                if wall > args.max_seconds:
+                    print(f"  ERROR: over the {args.max_seconds:.0f}s time ceiling")
+                    failures += 1
+                if rss > args.max_rss:
+                    print(f"  ERROR: over the {args.max_rss:.0f} MB memory ceiling")
+                    failures += 1
+
+                if size == 0:
+                    results[stage] = [(0, wall, rss)]
+                else:
+                    _, base_wall, base_rss = results[stage][0]
+                    results[stage].append(
+                        (size, max(wall - base_wall, MIN_SECONDS), max(rss - base_rss, MIN_RSS_MB))
+                    )
+
+            if args.work_dir is None:
+                shutil.rmtree(work_dir)
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    if len(args.sizes) >= 2:
+        print("\nGrowth above an empty corpus (1.0 is linear):")
+        for stage, points in results.items():
+            sizes = [size for size, _, _ in points[1:]]
+            time_exponent = growth_exponent(sizes, [wall for _, wall, _ in points[1:]])
+            memory_exponent = growth_exponent(sizes, [rss for _, _, rss in points[1:]])
+            print(f"  {stage}: time ~ n^{time_exponent:.2f}, memory ~ n^{memory_exponent:.2f}")
+
+            if args.ceilings_only:
+                continue
+            if time_exponent > args.max_exponent:
+                print(f"  ERROR: {stage} time grows faster than n^{args.max_exponent}")
+                failures += 1
+            if memory_exponent > args.max_exponent:
+                print(f"  ERROR: {stage} memory grows faster than n^{args.max_exponent}")
+                failures += 1
+
+    if failures:
+        print("\nScaling check FAILED")
+        return 1
+
+    print("\nScaling check PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
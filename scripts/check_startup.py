@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Check that the CLI starts fast and only imports what each command needs.
+
+Runs the everyday-phrases CLI in a fresh interpreter with ``-X importtime``
+and fails if a command exits with an unexpected status, exceeds its
+wall-time budget or imports a module that belongs to a different command.
+A command that crashes early would otherwise pass as fast and lean.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CLI_PATH = Path(__file__).parent / "everyday_phrases.py"
+
+# Modules that only the anki and site commands may import.
+HEAVY_MODULES = {"genanki", "jinja2"}
+
+# (CLI arguments, wall-time budget in seconds, forbidden top-level modules,
+#  expected exit status; validate runs on the repository's own phrases)
+BUDGETS = [
+    (["--help"], 0.5, HEAVY_MODULES | {"yaml"}, 0),
+    (["validate", "--help"], 0.75, HEAVY_MODULES, 0),
+    (["validate"], 1.5, HEAVY_MODULES, 0),
+]
+
+
+def parse_importtime(stderr: str) -> tuple[set[str], float, list[str]]:
+    """Return the top-level modules imported, the total import time in ms and other output."""
+    modules = set()
+    total_us = 0
+    other = []
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        if "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules.add(name.strip().split(".")[0])
+        total_us += int(self_us)
+
+    return modules, total_us / 1000, other
+
+
+def measure(cli_args: list[str], runs: int) -> tuple[int, float, float, set[str], list[str]]:
+    """Run the CLI several times and keep the fastest wall and import times.
+
+    Returns the exit status and error output too; stops at the first run
+    that exits with a non-zero status.
+    """
+    best_wall = float("inf")
+    best_import_ms = float("inf")
+    modules: set[str] = set()
+    errors: list[str] = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", str(CLI_PATH), *cli_args],
+            capture_output=True,
+            text=True,
+        )
+        wall = time.perf_counter() - start
+
+        modules, import_ms, errors = parse_importtime(result.stderr)
+        best_wall = min(best_wall, wall)
+        best_import_ms = min(best_import_ms, import_ms)
+        if result.returncode != 0:
+            break
+
+    return result.returncode, best_wall, best_import_ms, modules, errors
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="runs per command; the fastest one is compared to the budget",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiply every wall-time budget, e.g. on slow CI machines",
+    )
+    args = parser.parse_args(argv)
+
+    failures = 0
+
+    for cli_args, budget, forbidden, expected_status in BUDGETS:
+        label = " ".join(cli_args)
+        budget *= args.scale
+        status, wall, import_ms, modules, errors = measure(cli_args, args.runs)
+
+        print(f"{label}: {wall:.3f}s (budget {budget:.2f}s), imports {import_ms:.1f}ms")
+
+        if status != expected_status:
+            print(f"  ERROR: exited with status {status}, expected {expected_status}")
+            for line in errors[-10:]:
+                print(f"    {line}")
+            failures += 1
+
+        if wall > budget:
+            print(f"  ERROR: over the {budget:.2f}s startup budget")
+            failures += 1
+
+        leaked = sorted(modules & forbidden)
+        if leaked:
+            print(f"  ERROR: imported {', '.join(leaked)}")
+            failures += 1
+
+    if failures:
+        print("\nStartup check FAILED")
+        return 1
+
+    print("\nStartup check PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
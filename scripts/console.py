@@ -0,0 +1,161 @@
+"""Buffered console output shared by the scripts.
+
+Three levels: quiet (errors only), normal (summaries) and verbose (one line
+per file or phrase). ``--json`` switches to one JSON object per line for CI.
+Lines are buffered and written in batches; a progress bar is drawn on
+stderr when it is a terminal.
+"""
+
+import argparse
+import atexit
+import json
+import sys
+import time
+from typing import Any, Iterable, Iterator, TextIO, TypeVar
+
+QUIET = 0
+NORMAL = 1
+VERBOSE = 2
+
+BUFFER_LINES = 512
+PROGRESS_WIDTH = 30
+PROGRESS_INTERVAL = 0.1
+
+T = TypeVar("T")
+
+
+class Console:
+    """Leveled, buffered output in text or JSON-lines form."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stdout
+        self.level = NORMAL
+        self.json_lines = False
+        self._buffer: list[str] = []
+        atexit.register(self.flush)
+
+    def configure(self, level: int = NORMAL, json_lines: bool = False) -> None:
+        """Set the output level and format."""
+        self.level = level
+        self.json_lines = json_lines
+
+    @property
+    def verbose(self) -> bool:
+        """Whether per-item detail lines are shown.
+
+        Hot loops check this before formatting a detail message.
+        """
+        return self.level >= VERBOSE
+
+    def error(self, message: str, **fields: Any) -> None:
+        """Report an error; shown at every level."""
+        self._emit("error", message, fields)
+
+    def warning(self, message: str, **fields: Any) -> None:
+        """Report a warning; shown at every level."""
+        self._emit("warning", message, fields)
+
+    def info(self, message: str, **fields: Any) -> None:
+        """Report a summary line; hidden in quiet mode."""
+        if self.level >= NORMAL:
+            self._emit("info", message, fields)
+
+    def summary(self, counts: dict[str, int]) -> None:
+        """Report labelled totals under a separator; hidden in quiet mode."""
+        if self.level < NORMAL:
+            return
+        if self.json_lines:
+            self._emit("summary", "", {"counts": counts})
+        else:
+            lines = [f"{label}: {value}" for label, value in counts.items()]
+            self._emit("summary", "\n".join(["", "=" * 40, *lines]), {})
+
+    def detail(self, message: str, **fields: Any) -> None:
+        """Report per-item detail; only shown in verbose mode."""
+        if self.level >= VERBOSE:
+            self._emit("detail", message, fields)
+
+    def progress(self, items: Iterable[T], total: int, label: str) -> Iterator[T]:
+        """Yield ``items``, drawing a progress bar on an interactive stderr."""
+        if self.level != NORMAL or self.json_lines or not sys.stderr.isatty():
+            yield from items
+            return
+
+        self.flush()
+        last_draw = 0.0
+        count = 0
+        for count, item in enumerate(items, 1):
+            yield item
+            now = time.monotonic()
+            if now - last_draw >= PROGRESS_INTERVAL:
+                self._draw_progress(label, count, total)
+                last_draw = now
+
+        self._draw_progress(label, count, total)
+        sys.stderr.write("\n")
+        sys.stderr.flush()
+
+    def flush(self) -> None:
+        """Write buffered lines to the stream."""
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+        self.stream.flush()
+
+    def _emit(self, level: str, message: str, fields: dict[str, Any]) -> None:
+        if self.json_lines:
+            record = {"level": level, **fields}
+            if message.strip():
+                record["message"] = message.strip()
+            line = json.dumps(record, ensure_ascii=False, default=str)
+        else:
+            line = message
+        self._buffer.append(line + "\n")
+        if len(self._buffer) >= BUFFER_LINES:
+            self.flush()
+
+    def _draw_progress(self, label: str, count: int, total: int) -> None:
+        filled = PROGRESS_WIDTH * count // total if total else PROGRESS_WIDTH
+        bar = "#" * filled + "-" * (PROGRESS_WIDTH - filled)
+        sys.stderr.write(f"\r{label} [{bar}] {count}/{total}")
+        sys.stderr.flush()
+
+
+console = Console()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the shared -q/-v/--json options to a script's parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "-q", "--quiet", action="store_true", help="only report errors"
+    )
+    group.add_argument(
+        "-v", "--verbose", action="store_true", help="report every file and phrase"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="write output as JSON lines"
+    )
+
+
+def configure(args: argparse.Namespace) -> None:
+    """Configure the shared console from parsed arguments."""
+    if args.quiet:
+        level = QUIET
+    elif args.verbose:
+        level = VERBOSE
+    else:
+        level = NORMAL
+    console.configure(level, args.json)
+
+
+def forwarded_arguments(args: argparse.Namespace) -> list[str]:
+    """Rebuild the shared options, to pass them on to another script."""
+    argv = []
+    if args.quiet:
+        argv.append("--quiet")
+    if args.verbose:
+        argv.append("--verbose")
+    if args.json:
+        argv.append("--json")
+    return argv
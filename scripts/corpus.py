@@ -0,0 +1,163 @@
+"""Load phrase YAML files; shared by the build scripts and the lookup service."""
+
+import os
+from pathlib import Path
+from typing import IO, Any, Callable
+
+import yaml
+
+CATEGORY_FILE = "_category.yaml"
+
+# The libyaml-backed loader is several times faster when it is available.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+ErrorHandler = Callable[[Path, yaml.YAMLError], None]
+ScanHandler = Callable[[Path, str], None]
+
+
+def parse_yaml(content: str | bytes | IO[str]) -> Any:
+    """Parse YAML text or a stream. Raises yaml.YAMLError on invalid syntax."""
+    return yaml.load(content, Loader=YamlLoader)
+
+
+def read_yaml(file_path: Path) -> Any:
+    """Parse a YAML file. Raises yaml.YAMLError on invalid syntax."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return parse_yaml(f)
+
+
+class Category:
+    """A category directory, with its metadata file and phrase files.
+
+    Categories nest: ``daily-life/transport`` is a subcategory of
+    ``daily-life``, and its slug is the path relative to the phrases
+    directory. Phrase files in shard directories (subdirectories without
+    _category.yaml) are listed with the category's own files.
+    """
+
+    def __init__(self, slug: str, path: Path, meta_file: Path, files: list[Path]):
+        self.slug = slug
+        self.path = path
+        self.meta_file = meta_file
+        self.files = files
+
+    @property
+    def parent(self) -> str | None:
+        """Slug of the enclosing category, or None at the top level."""
+        return self.slug.rpartition("/")[0] or None
+
+    @property
+    def depth(self) -> int:
+        """Nesting level: 0 for top-level categories."""
+        return self.slug.count("/")
+
+    def file_name(self, yaml_file: Path) -> str:
+        """Path of a phrase file within the category, e.g. ``shard-a/signs.yaml``."""
+        return yaml_file.relative_to(self.path).as_posix()
+
+
+def scan_categories(phrases_dir: Path, on_skip: ScanHandler | None = None) -> list[Category]:
+    """Find every category under the phrases directory, at any depth.
+
+    A directory with _category.yaml is a category. A directory without one
+    is a shard of the enclosing category: its phrase files, and those of any
+    directories below it, belong to that category. Top-level directories
+    without _category.yaml have no category to join, so they are skipped,
+    and _category.yaml files inside a shard are ignored; both are reported
+    to ``on_skip`` with a message.
+
+    Each directory is listed once with ``os.scandir``, and entries are
+    sorted by name, so the result does not depend on file system order.
+    Parents come before their subcategories. Hidden directories are skipped.
+    """
+    categories = []
+
+    def skip(path: Path, message: str) -> None:
+        if on_skip is not None:
+            on_skip(path, message)
+
+    def walk(path: Path, slug: str, category: Category | None, in_shard: bool) -> None:
+        with os.scandir(path) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+
+        subdirs = []
+        files = []
+        meta_file = None
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                subdirs.append(entry)
+            elif entry.name == CATEGORY_FILE:
+                meta_file = Path(entry.path)
+            elif entry.name.endswith(".yaml") and entry.is_file():
+                files.append(Path(entry.path))
+
+        if meta_file is not None and not in_shard:
+            category = Category(slug, path, meta_file, files)
+            categories.append(category)
+        elif category is None:
+            skip(path, f"no {CATEGORY_FILE}, so the directory is not a category")
+            return
+        else:
+            if meta_file is not None:
+                skip(meta_file, f"{CATEGORY_FILE} inside a shard of {category.slug} is ignored")
+            category.files.extend(files)
+            in_shard = True
+
+        for entry in subdirs:
+            walk(Path(entry.path), f"{slug}/{entry.name}", category, in_shard)
+
+    with os.scandir(phrases_dir) as entries:
+        top_level = sorted(
+            (entry for entry in entries if entry.is_dir() and not entry.name.startswith(".")),
+            key=lambda entry: entry.name,
+        )
+    for entry in top_level:
+        walk(Path(entry.path), entry.name, None, False)
+
+    return categories
+
+
+def load_category_metadata(category: Category) -> dict[str, Any] | None:
+    """Load category metadata from _category.yaml."""
+    try:
+        return read_yaml(category.meta_file)
+    except yaml.YAMLError:
+        return None
+
+
+def load_category_phrases(
+    category: Category, on_error: ErrorHandler | None = None
+) -> list[dict[str, Any]]:
+    """Load the raw phrase entries of one category and its shards, without subcategories.
+
+    Files with invalid YAML are skipped and reported to ``on_error``.
+    """
+    phrases = []
+
+    for yaml_file in category.files:
+        try:
+            data = read_yaml(yaml_file)
+        except yaml.YAMLError as e:
+            if on_error is not None:
+                on_error(yaml_file, e)
+            continue
+
+        if isinstance(data, dict) and isinstance(data.get("phrases"), list):
+            phrases.extend(data["phrases"])
+
+    return phrases
+
+
+def load_phrases(
+    phrases_dir: Path, on_error: ErrorHandler | None = None, on_skip: ScanHandler | None = None
+) -> list[tuple[str, dict[str, Any]]]:
+    """Load all phrases as (category slug, phrase) pairs in a stable order."""
+    phrases = []
+
+    for category in scan_categories(phrases_dir, on_skip):
+        for phrase in load_category_phrases(category, on_error):
+            phrases.append((category.slug, phrase))
+
+    return phrases
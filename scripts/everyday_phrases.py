@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Everyday English Phrases command line interface.
+
+Usage: everyday-phrases <command> [options]
+
+Each subcommand imports its script only when it runs, so ``--help`` and
+``validate`` never pay for genanki or Jinja2.
+"""
+
+import argparse
+import sys
+from importlib import import_module
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import console as console_options  # noqa: E402
+from console import console  # noqa: E402
+
+# Subcommand name -> (module, help text). Modules are imported on dispatch.
+COMMANDS = {
+    "validate": ("validate", "Validate phrase YAML files"),
+    "anki": ("generate_anki", "Generate the Anki deck"),
+    "site": ("generate_site", "Generate the GitHub Pages site"),
+    "serve": ("serve", "Serve phrase lookups as JSON over HTTP"),
+    "import": ("import_phrases", "Import phrases from a CSV or TSV file"),
+    "quality": ("quality", "Flag suspicious translations (needs NumPy)"),
+}
+
+BUILD_STEPS = ["validate", "anki", "site"]
+
+
+def run_command(name: str, argv: list[str]) -> int:
+    """Import the module behind a subcommand and run its entry point."""
+    module_name, _ = COMMANDS[name]
+    module = import_module(module_name)
+    return module.main(argv)
+
+
+def run_build(argv: list[str]) -> int:
+    """Validate, then generate the Anki deck and the site."""
+    parser = argparse.ArgumentParser(
+        prog="everyday-phrases build",
+        description="Validate phrases, then generate the Anki deck and the site.",
+    )
+    parser.add_argument(
+        "--phrases-dir",
+        type=Path,
+        help="directory containing the phrase categories",
+    )
+    console_options.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    step_argv = console_options.forwarded_arguments(args)
+    if args.phrases_dir is not None:
+        step_argv += ["--phrases-dir", str(args.phrases_dir)]
+
+    for step in BUILD_STEPS:
+        result = run_command(step, step_argv)
+        if result != 0:
+            console.error(f"\nBuild stopped: '{step}' failed", step=step)
+            return result
+
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the top-level argument parser."""
+    commands = "\n".join(
+        f"  {name:<10}{help_text}" for name, (_, help_text) in COMMANDS.items()
+    )
+    parser = argparse.ArgumentParser(
+        prog="everyday-phrases",
+        description="Build tools for the Everyday English Phrases collection.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            f"commands:\n{commands}\n"
+            f"  {'build':<10}Run validate, anki and site in order\n\n"
+            "Run 'everyday-phrases <command> --help' for command options."
+        ),
+    )
+    parser.add_argument("command", choices=[*COMMANDS, "build"], metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    args = build_parser().parse_args(argv)
+
+    if args.command == "build":
+        return run_build(args.args)
+
+    return run_command(args.command, args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,29 @@
 #!/usr/bin/env python3
 """Generate Anki deck from phrase YAML files."""
 
+import argparse
 import hashlib
 import random
 import sys
+import tempfile
 from pathlib import Path
 from typing import Any
 
 import genanki
 import yaml
 
-MODEL_ID = 1607392319
+import console as console_options
+import corpus
+from console import console
+from media import MediaStore
+
+# Anki cannot change the fields of an existing note type on import, so the
+# note type gets a new id whenever its fields change (v2 added Audio and
+# Image). The previous id was 1607392319; see "Upgrading" in the README.
+MODEL_ID = 1607392320
+MODEL_NAME = "Everyday English Phrase v2"
 DECK_ID = 2059400110
+DECK_NAME = "Everyday English Phrases"
 
 CARD_CSS = """
 .card {
@@ -100,6 +112,11 @@ CARD_CSS = """
   color: #999;
 }
 
+.image img {
+  max-width: 100%;
+  border-radius: 5px;
+}
+
 hr {
   border: none;
   border-top: 1px solid #eee;
@@ -116,6 +133,9 @@ FRONT_TEMPLATE = """
   {{#Context}}
   <div class="context">{{Context}}</div>
   {{/Context}}
+  {{#Image}}
+  <div class="image">{{Image}}</div>
+  {{/Image}}
 </div>
 """
 
@@ -125,6 +145,7 @@ BACK_TEMPLATE = """
   {{#Pronunciation}}
   <div class="pronunciation">{{Pronunciation}}</div>
   {{/Pronunciation}}
+  {{Audio}}
 
   <hr>
 
@@ -158,7 +179,7 @@ BACK_TEMPLATE = """
 
 phrase_model = genanki.Model(
     MODEL_ID,
-    "Everyday English Phrase",
+    MODEL_NAME,
     fields=[
         {"name": "Phrase"},
         {"name": "Pronunciation"},
@@ -170,6 +191,8 @@ phrase_model = genanki.Model(
         {"name": "CulturalNote"},
         {"name": "Difficulty"},
         {"name": "Tags"},
+        {"name": "Audio"},
+        {"name": "Image"},
     ],
     templates=[
         {
@@ -188,8 +211,39 @@ def generate_note_id(phrase_id: str) -> int:
     return int.from_bytes(hash_bytes[:8], byteorder="big") % (2**31)
 
 
-def create_note(phrase: dict[str, Any], category: str) -> genanki.Note:
-    """Create an Anki note from a phrase entry."""
+def generate_deck_id(slug: str) -> int:
+    """Generate a stable deck ID from a category slug."""
+    hash_bytes = hashlib.md5(f"deck:{slug}".encode()).digest()
+    return int.from_bytes(hash_bytes[:8], byteorder="big") % (2**31)
+
+
+def category_decks(categories: list[corpus.Category]) -> dict[str, genanki.Deck]:
+    """Create a subdeck per category, nested like the category directories.
+
+    Deck names use each category's English name, joined with Anki's ``::``
+    separator, e.g. "Everyday English Phrases::Daily Life::Transport".
+    """
+    names: dict[str, str] = {}
+    decks = {}
+
+    for category in categories:
+        meta = corpus.load_category_metadata(category)
+        name = meta.get("name") if isinstance(meta, dict) else None
+        name = name.get("en") if isinstance(name, dict) else None
+        parent = names[category.parent] if category.parent else DECK_NAME
+        names[category.slug] = f"{parent}::{name or category.path.name}"
+        decks[category.slug] = genanki.Deck(generate_deck_id(category.slug), names[category.slug])
+
+    return decks
+
+
+def create_note(
+    phrase: dict[str, Any], category: str, media: dict[str, str] | None = None
+) -> genanki.Note:
+    """Create an Anki note from a phrase entry.
+
+    ``media`` maps "audio" and "image" to content-addressed media file names.
+    """
     phrase_id = phrase.get("id", "")
     phrase_text = phrase.get("phrase", "")
     pronunciation = phrase.get("pronunciation", "")
@@ -209,9 +263,13 @@ def create_note(phrase: dict[str, Any], category: str) -> genanki.Note:
     cultural_text = cultural_note.get("en", "") if isinstance(cultural_note, dict) else ""
 
     difficulty = phrase.get("difficulty", "intermediate")
-    tags = phrase.get("tags", [])
+    tags = [str(tag) for tag in phrase.get("tags", [])]
     tags_text = ", ".join(tags) if tags else ""
 
+    media = media or {}
+    audio = f"[sound:{media['audio']}]" if "audio" in media else ""
+    image = f'<img src="{media["image"]}">' if "image" in media else ""
+
     note = genanki.Note(
         model=phrase_model,
         fields=[
@@ -225,79 +283,121 @@ def create_note(phrase: dict[str, Any], category: str) -> genanki.Note:
             cultural_text,
             difficulty,
             tags_text,
+            audio,
+            image,
         ],
         guid=str(generate_note_id(phrase_id)),
-        tags=[category] + tags,
+        tags=[category.replace("/", "::")] + tags,
     )
 
     return note
 
 
-def load_phrases(phrases_dir: Path) -> list[tuple[str, dict[str, Any]]]:
-    """Load all phrases from YAML files."""
-    phrases = []
+def load_phrases(categories: list[corpus.Category]) -> list[tuple[str, dict[str, Any]]]:
+    """Load the phrases of every category from YAML files."""
+
+    def warn(yaml_file: Path, error: yaml.YAMLError) -> None:
+        console.error(
+            f"Warning: Skipping {yaml_file} due to YAML error: {error}",
+            file=str(yaml_file),
+            error=str(error),
+        )
 
-    for category_dir in phrases_dir.iterdir():
-        if not category_dir.is_dir():
-            continue
+    return [
+        (category.slug, phrase)
+        for category in categories
+        for phrase in corpus.load_category_phrases(category, on_error=warn)
+    ]
 
-        category_name = category_dir.name
 
-        for yaml_file in category_dir.glob("*.yaml"):
-            if yaml_file.name == "_category.yaml":
-                continue
+def generate_deck(
+    phrases_dir: Path, output_path: Path, media_store: MediaStore | None = None
+) -> int:
+    """Generate the Anki deck, with a subdeck per category.
 
-            try:
-                with open(yaml_file, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                print(f"Warning: Skipping {yaml_file} due to YAML error: {e}")
-                continue
+    With ``media_store``, referenced media files are packed into the deck
+    once each, under their content-addressed names.
+    """
 
-            if data and "phrases" in data:
-                for phrase in data["phrases"]:
-                    phrases.append((category_name, phrase))
+    def warn(path: Path, message: str) -> None:
+        console.error(f"Warning: Skipping {path}: {message}", file=str(path), error=message)
 
-    return phrases
+    categories = corpus.scan_categories(phrases_dir, on_skip=warn)
+    decks = category_decks(categories)
 
+    phrases = load_phrases(categories)
+    console.info(f"Found {len(phrases)} phrases", phrases=len(phrases))
 
-def generate_deck(phrases_dir: Path, output_path: Path) -> int:
-    """Generate the Anki deck."""
-    deck = genanki.Deck(DECK_ID, "Everyday English Phrases")
+    for category, phrase in console.progress(phrases, len(phrases), "Adding notes"):
+        media = media_store.resolve_phrase(phrase) if media_store else None
+        note = create_note(phrase, category, media)
+        decks[category].add_note(note)
+        if console.verbose:
+            console.detail(f"  Added: {phrase.get('phrase', 'unknown')}", id=phrase.get("id"))
 
-    phrases = load_phrases(phrases_dir)
-    print(f"Found {len(phrases)} phrases")
+    root = genanki.Deck(DECK_ID, DECK_NAME)
 
-    for category, phrase in phrases:
-        note = create_note(phrase, category)
-        deck.add_note(note)
-        print(f"  Added: {phrase.get('phrase', 'unknown')}")
+    # genanki stores files under their base name, so stage hashed copies in
+    # a private directory that is removed once the package is written.
+    with tempfile.TemporaryDirectory(prefix="anki-media-") as staging:
+        media_files = []
+        if media_store is not None and media_store.files:
+            media_store.copy_to(Path(staging))
+            media_files = [str(Path(staging) / name) for name in media_store.files]
+            console.info(f"Packed {len(media_files)} media files", media_files=len(media_files))
 
-    package = genanki.Package(deck)
-    package.write_to_file(str(output_path))
+        package = genanki.Package([root, *decks.values()], media_files=media_files)
+        package.write_to_file(str(output_path))
 
     return len(phrases)
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Main entry point."""
     script_dir = Path(__file__).parent
     project_dir = script_dir.parent
-    phrases_dir = project_dir / "phrases"
-    output_dir = project_dir / "output"
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--phrases-dir",
+        type=Path,
+        default=project_dir / "phrases",
+        help="directory containing the phrase categories",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=project_dir / "output" / "everyday-english.apkg",
+        help="path of the .apkg file to write",
+    )
+    parser.add_argument(
+        "--media-dir",
+        type=Path,
+        default=project_dir / "media",
+        help="directory that phrase media references are relative to",
+    )
+    console_options.add_arguments(parser)
+    args = parser.parse_args(argv)
+    console_options.configure(args)
+    phrases_dir = args.phrases_dir
+    output_path = args.output
 
     if not phrases_dir.exists():
-        print(f"ERROR: Phrases directory not found: {phrases_dir}")
+        console.error(f"ERROR: Phrases directory not found: {phrases_dir}")
         return 1
 
-    output_dir.mkdir(exist_ok=True)
-    output_path = output_dir / "everyday-english.apkg"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    print("Generating Anki deck...")
-    count = generate_deck(phrases_dir, output_path)
+    console.info("Generating Anki deck...")
+    media_store = MediaStore(args.media_dir, project_dir / ".cache" / "media-hashes.json")
+    count = generate_deck(phrases_dir, output_path, media_store)
+    media_store.save_cache()
 
-    print(f"\nGenerated deck with {count} cards")
-    print(f"Output: {output_path}")
+    console.info(
+        f"\nGenerated deck with {count} cards\nOutput: {output_path}",
+        cards=count,
+        output=str(output_path),
+    )
 
     return 0
 
@@ -1,12 +1,24 @@
 #!/usr/bin/env python3
 """Generate GitHub Pages site from phrase YAML files."""
 
+import argparse
+import hashlib
+import json
+import os
+import re
 import sys
 from pathlib import Path
-from typing import Any
+from stat import S_ISDIR
+from typing import Any, Iterable
 
 import yaml
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
+
+import console as console_options
+from console import console
+from corpus import parse_yaml, read_yaml, scan_categories
+from media import MediaStore, media_signature
+from validate import PHRASE_ID_PATTERN
 
 INDEX_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
@@ -66,6 +78,20 @@ INDEX_TEMPLATE = """<!DOCTYPE html>
         .category-name-zh { color: #666; font-size: 0.9em; }
         .category-desc { color: #888; font-size: 0.9em; margin-top: 10px; }
         .phrase-count { color: #4a90d9; font-size: 0.85em; margin-top: 10px; }
+        .tag-section { margin-top: 40px; }
+        .tag-section h2 { font-size: 1.2em; margin-bottom: 15px; }
+        .tag {
+            display: inline-block;
+            padding: 2px 10px;
+            background: #e9ecef;
+            border-radius: 15px;
+            font-size: 0.85em;
+            color: #666;
+            margin: 0 5px 8px 0;
+            text-decoration: none;
+        }
+        .tag:hover { background: #dde2e6; }
+        .filter-link { display: inline-block; margin-top: 20px; color: #4a90d9; }
         footer {
             margin-top: 40px;
             padding-top: 20px;
@@ -87,17 +113,28 @@ INDEX_TEMPLATE = """<!DOCTYPE html>
     <input type="text" class="search-box" placeholder="Search phrases... 搜索短语..." id="search" autocomplete="off">
 
     <div class="categories">
-        {% for cat in categories %}
-        <a href="categories/{{ cat.slug }}.html" class="category-card">
+        {% for cat in categories if not cat.parent %}
+        <a href="categories/{{ cat.page }}.html" class="category-card">
             <div class="category-icon">{{ cat.icon }}</div>
             <div class="category-name">{{ cat.name_en }}</div>
             <div class="category-name-zh">{{ cat.name_zh }}</div>
             <div class="category-desc">{{ cat.desc_en }}</div>
-            <div class="phrase-count">{{ cat.phrase_count }} phrases</div>
+            <div class="phrase-count">{{ cat.total_count }} phrases</div>
         </a>
         {% endfor %}
     </div>
 
+    {% if tags %}
+    <section class="tag-section">
+        <h2>Browse by tag 按标签浏览</h2>
+        {% for tag in tags %}
+        <a href="tags/{{ tag.slug }}.html" class="tag">{{ tag.name }} ({{ tag.phrase_count }})</a>
+        {% endfor %}
+    </section>
+    {% endif %}
+
+    <a href="filter.html" class="filter-link">🔎 Filter all phrases by category, level and tag</a>
+
     <footer>
         <p>
             <a href="https://github.com/liyun95/everyday-english-phrases">GitHub</a> ·
@@ -149,6 +186,24 @@ CATEGORY_TEMPLATE = """<!DOCTYPE html>
         }
         h1 { font-size: 1.8em; margin-bottom: 5px; }
         .subtitle { color: #666; }
+        .subcategories {
+            display: grid;
+            gap: 10px;
+            margin-bottom: 20px;
+        }
+        .subcategory-card {
+            display: block;
+            background: #fff;
+            border: 1px solid #eee;
+            border-radius: 12px;
+            padding: 12px 20px;
+            text-decoration: none;
+            color: inherit;
+        }
+        .subcategory-card:hover { box-shadow: 0 4px 12px rgba(0,0,0,0.1); }
+        .subcategory-name { font-weight: bold; margin-right: 10px; }
+        .subcategory-name-zh { color: #666; font-size: 0.9em; }
+        .subcategory-count { float: right; color: #4a90d9; font-size: 0.85em; }
         .search-box {
             width: 100%;
             padding: 12px;
@@ -207,6 +262,13 @@ CATEGORY_TEMPLATE = """<!DOCTYPE html>
             border-left: 3px solid #4a90d9;
         }
         .example-en { margin-bottom: 3px; }
+        .phrase-image {
+            display: block;
+            max-width: 100%;
+            margin: 10px 0;
+            border-radius: 8px;
+        }
+        .phrase-audio { display: block; margin: 10px 0; }
         .example-zh { color: #666; font-size: 0.9em; }
         .cultural-note {
             margin-top: 15px;
@@ -232,19 +294,74 @@ CATEGORY_TEMPLATE = """<!DOCTYPE html>
             color: #666;
             margin-right: 5px;
             margin-bottom: 5px;
+            text-decoration: none;
         }
+        .filters { margin-bottom: 20px; }
+        .difficulty-filter {
+            padding: 6px 10px;
+            font-size: 14px;
+            border: 2px solid #ddd;
+            border-radius: 8px;
+            margin-bottom: 10px;
+        }
+        .tag-filter {
+            padding: 2px 10px;
+            background: #e9ecef;
+            border: 1px solid transparent;
+            border-radius: 15px;
+            font-size: 0.8em;
+            color: #666;
+            margin: 0 5px 5px 0;
+            cursor: pointer;
+        }
+        .tag-filter.active {
+            background: #4a90d9;
+            color: #fff;
+        }
+        .filter-count { color: #888; font-size: 0.85em; }
     </style>
 </head>
 <body>
+    {% if category.parent_link -%}
+    <a href="{{ category.parent_link.page }}.html" class="back-link">← Back to {{ category.parent_link.name_en }}</a>
+    {%- else -%}
     <a href="../index.html" class="back-link">← Back to categories</a>
+    {%- endif %}
 
     <header>
         <h1>{{ category.icon }} {{ category.name_en }}</h1>
         <p class="subtitle">{{ category.name_zh }}</p>
     </header>
+    {%- if category.subcategories %}
+
+    <div class="subcategories">
+        {% for sub in category.subcategories %}
+        <a href="{{ sub.page }}.html" class="subcategory-card">
+            <span class="subcategory-name">{{ sub.icon }} {{ sub.name_en }}</span>
+            <span class="subcategory-name-zh">{{ sub.name_zh }}</span>
+            <span class="subcategory-count">{{ sub.total_count }} phrases</span>
+        </a>
+        {% endfor %}
+    </div>
+    {%- endif %}
 
     <input type="text" class="search-box" placeholder="Search in this category..." id="search" autocomplete="off">
 
+    <div class="filters">
+        <select class="difficulty-filter" id="difficulty-filter">
+            <option value="">All levels</option>
+            {% for difficulty in facets.difficulty %}
+            <option value="{{ difficulty }}">{{ difficulty }}</option>
+            {% endfor %}
+        </select>
+        <div>
+            {% for tag in facets.tag %}
+            <button type="button" class="tag-filter" data-tag="{{ tag }}">{{ tag }}</button>
+            {% endfor %}
+        </div>
+        <div class="filter-count" id="filter-count">{{ phrases|length }} phrases</div>
+    </div>
+
     <ul class="phrase-list">
         {% for phrase in phrases %}
         <li class="phrase-item" data-search="{{ phrase.phrase|lower }} {{ phrase.meaning_en|lower }} {{ phrase.meaning_zh }}">
@@ -258,6 +375,13 @@ CATEGORY_TEMPLATE = """<!DOCTYPE html>
                 <span class="difficulty {{ phrase.difficulty }}">{{ phrase.difficulty }}</span>
             </div>
 
+            {% if phrase.image %}
+            <img class="phrase-image" src="../media/{{ phrase.image }}" alt="{{ phrase.phrase }}" loading="lazy">
+            {% endif %}
+            {% if phrase.audio %}
+            <audio class="phrase-audio" controls preload="none" src="../media/{{ phrase.audio }}"></audio>
+            {% endif %}
+
             <div class="meaning">
                 <div class="meaning-en">{{ phrase.meaning_en }}</div>
                 <div class="meaning-zh">{{ phrase.meaning_zh }}</div>
@@ -280,7 +404,7 @@ CATEGORY_TEMPLATE = """<!DOCTYPE html>
             {% if phrase.tags %}
             <div class="tags">
                 {% for tag in phrase.tags %}
-                <span class="tag">{{ tag }}</span>
+                <a class="tag" href="../tags/{{ tag|tag_slug }}.html">{{ tag }}</a>
                 {% endfor %}
             </div>
             {% endif %}
@@ -288,138 +412,1105 @@ CATEGORY_TEMPLATE = """<!DOCTYPE html>
         {% endfor %}
     </ul>
 
+    <script type="application/json" id="facet-index">{{ facets|tojson }}</script>
     <script>
-        document.getElementById('search').addEventListener('input', function(e) {
-            const query = e.target.value.toLowerCase();
-            document.querySelectorAll('.phrase-item').forEach(item => {
-                const text = item.dataset.search;
-                item.style.display = text.includes(query) ? '' : 'none';
+        // Facet values map to sorted positions in the phrase list, so filters
+        // combine by intersecting id arrays instead of inspecting the DOM.
+        const facets = JSON.parse(document.getElementById('facet-index').textContent);
+        const items = Array.from(document.querySelectorAll('.phrase-item'));
+        const search = document.getElementById('search');
+        const difficultyFilter = document.getElementById('difficulty-filter');
+        const filterCount = document.getElementById('filter-count');
+        const selectedTags = new Set();
+
+        function intersect(a, b) {
+            const result = [];
+            let i = 0, j = 0;
+            while (i < a.length && j < b.length) {
+                if (a[i] === b[j]) { result.push(a[i]); i++; j++; }
+                else if (a[i] < b[j]) { i++; }
+                else { j++; }
+            }
+            return result;
+        }
+
+        function applyFilters() {
+            const query = search.value.toLowerCase();
+            const lists = [];
+            if (difficultyFilter.value) {
+                lists.push(facets.difficulty[difficultyFilter.value] || []);
+            }
+            selectedTags.forEach(tag => lists.push(facets.tag[tag] || []));
+
+            const mask = new Uint8Array(items.length);
+            if (lists.length === 0) {
+                mask.fill(1);
+            } else {
+                lists.sort((a, b) => a.length - b.length);
+                lists.reduce(intersect).forEach(i => { mask[i] = 1; });
+            }
+
+            let shown = 0;
+            items.forEach((item, i) => {
+                const show = mask[i] === 1 && (!query || item.dataset.search.includes(query));
+                item.style.display = show ? '' : 'none';
+                shown += show ? 1 : 0;
+            });
+            filterCount.textContent = shown + ' phrases';
+        }
+
+        search.addEventListener('input', applyFilters);
+        difficultyFilter.addEventListener('change', applyFilters);
+        document.querySelectorAll('.tag-filter').forEach(button => {
+            button.addEventListener('click', function() {
+                const tag = button.dataset.tag;
+                if (selectedTags.has(tag)) { selectedTags.delete(tag); } else { selectedTags.add(tag); }
+                button.classList.toggle('active');
+                applyFilters();
+            });
+        });
+    </script>
+</body>
+</html>
+"""
+
+
+FILTER_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Filter all phrases - Everyday English Phrases</title>
+    <style>
+        * { box-sizing: border-box; margin: 0; padding: 0; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .back-link {
+            display: inline-block;
+            margin-bottom: 20px;
+            color: #4a90d9;
+            text-decoration: none;
+        }
+        .back-link:hover { text-decoration: underline; }
+        header {
+            margin-bottom: 30px;
+            padding-bottom: 20px;
+            border-bottom: 1px solid #eee;
+        }
+        h1 { font-size: 1.8em; margin-bottom: 5px; }
+        .subtitle { color: #666; }
+        .filters { margin-bottom: 20px; }
+        .category-filter, .difficulty-filter {
+            padding: 6px 10px;
+            font-size: 14px;
+            border: 2px solid #ddd;
+            border-radius: 8px;
+            margin: 0 5px 10px 0;
+        }
+        .tag-filter {
+            padding: 2px 10px;
+            background: #e9ecef;
+            border: 1px solid transparent;
+            border-radius: 15px;
+            font-size: 0.8em;
+            color: #666;
+            margin: 0 5px 5px 0;
+            cursor: pointer;
+        }
+        .tag-filter.active {
+            background: #4a90d9;
+            color: #fff;
+        }
+        .filter-count { color: #888; font-size: 0.85em; }
+        .phrase-list { list-style: none; }
+        .phrase-item {
+            background: #fff;
+            border: 1px solid #eee;
+            border-radius: 12px;
+            padding: 20px;
+            margin-bottom: 15px;
+        }
+        .phrase-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: flex-start;
+            margin-bottom: 10px;
+        }
+        .phrase-text {
+            font-size: 1.3em;
+            font-weight: bold;
+            color: #333;
+        }
+        .difficulty {
+            padding: 2px 8px;
+            border-radius: 10px;
+            font-size: 0.75em;
+        }
+        .beginner { background: #d4edda; color: #155724; }
+        .intermediate { background: #fff3cd; color: #856404; }
+        .advanced { background: #f8d7da; color: #721c24; }
+        .meaning-en { font-size: 1em; margin-bottom: 5px; }
+        .meaning-zh { color: #666; }
+        .phrase-category {
+            display: inline-block;
+            margin-top: 10px;
+            color: #4a90d9;
+            font-size: 0.85em;
+            text-decoration: none;
+        }
+        .more-button {
+            display: block;
+            width: 100%;
+            padding: 10px;
+            font-size: 14px;
+            background: #fff;
+            border: 2px solid #ddd;
+            border-radius: 8px;
+            cursor: pointer;
+        }
+    </style>
+</head>
+<body>
+    <a href="index.html" class="back-link">← Back to categories</a>
+
+    <header>
+        <h1>🔎 Filter all phrases</h1>
+        <p class="subtitle">筛选全部短语</p>
+    </header>
+
+    <div class="filters">
+        <select class="category-filter" id="category-filter">
+            <option value="">All categories</option>
+            {% for cat in categories %}
+            <option value="{{ cat.slug }}">{{ "— " * cat.slug.count("/") }}{{ cat.name_en }}</option>
+            {% endfor %}
+        </select>
+        <select class="difficulty-filter" id="difficulty-filter">
+            <option value="">All levels</option>
+            {% for difficulty in difficulties %}
+            <option value="{{ difficulty }}">{{ difficulty }}</option>
+            {% endfor %}
+        </select>
+        <div>
+            {% for tag in tags %}
+            <button type="button" class="tag-filter" data-tag="{{ tag.name }}">{{ tag.name }}</button>
+            {% endfor %}
+        </div>
+        <div class="filter-count" id="filter-count">Loading...</div>
+    </div>
+
+    <ul class="phrase-list" id="results"></ul>
+    <button type="button" class="more-button" id="more" style="display: none">Show more</button>
+
+    <script type="application/json" id="category-index">{{ category_index|tojson }}</script>
+    <script>
+        // facets.json maps every tag, difficulty and category to sorted
+        // positions in its id list, so filters combine by intersecting arrays.
+        // Only the phrases on screen are fetched, from the JSON API.
+        const PAGE_SIZE = 50;
+        const categories = JSON.parse(document.getElementById('category-index').textContent);
+        const categoryFilter = document.getElementById('category-filter');
+        const difficultyFilter = document.getElementById('difficulty-filter');
+        const filterCount = document.getElementById('filter-count');
+        const results = document.getElementById('results');
+        const moreButton = document.getElementById('more');
+        const selectedTags = new Set();
+        let facets = null;
+        let ids = [];
+        let matches = [];
+        let shown = 0;
+
+        function intersect(a, b) {
+            const result = [];
+            let i = 0, j = 0;
+            while (i < a.length && j < b.length) {
+                if (a[i] === b[j]) { result.push(a[i]); i++; j++; }
+                else if (a[i] < b[j]) { i++; }
+                else { j++; }
+            }
+            return result;
+        }
+
+        function categoryIds(slug) {
+            // A category includes the phrases of its subcategories.
+            return Object.keys(facets.category)
+                .filter(key => key === slug || key.startsWith(slug + '/'))
+                .flatMap(key => facets.category[key])
+                .sort((a, b) => a - b);
+        }
+
+        function element(tag, className, text) {
+            const node = document.createElement(tag);
+            node.className = className;
+            if (text) { node.textContent = text; }
+            return node;
+        }
+
+        function renderPhrase(id) {
+            const item = element('li', 'phrase-item');
+            const header = element('div', 'phrase-header');
+            header.appendChild(element('span', 'phrase-text', id));
+            item.appendChild(header);
+
+            fetch('api/phrases/' + encodeURIComponent(id) + '.json')
+                .then(response => response.ok ? response.json() : null)
+                .then(phrase => {
+                    if (!phrase) { return; }
+                    header.firstChild.textContent = phrase.phrase;
+                    header.appendChild(element('span', 'difficulty ' + phrase.difficulty, phrase.difficulty));
+                    const meaning = phrase.meaning || {};
+                    item.appendChild(element('div', 'meaning-en', meaning.en));
+                    item.appendChild(element('div', 'meaning-zh', meaning.zh));
+                    const category = categories[phrase.category];
+                    if (category) {
+                        const link = element('a', 'phrase-category', category.name_en);
+                        link.href = 'categories/' + category.page + '.html';
+                        item.appendChild(link);
+                    }
+                });
+            return item;
+        }
+
+        function showMore() {
+            const batch = matches.slice(shown, shown + PAGE_SIZE);
+            shown += batch.length;
+            batch.forEach(i => results.appendChild(renderPhrase(ids[i])));
+            moreButton.style.display = shown < matches.length ? '' : 'none';
+        }
+
+        function applyFilters() {
+            if (!facets) { return; }
+            const lists = [];
+            if (categoryFilter.value) {
+                lists.push(categoryIds(categoryFilter.value));
+            }
+            if (difficultyFilter.value) {
+                lists.push(facets.difficulty[difficultyFilter.value] || []);
+            }
+            selectedTags.forEach(tag => lists.push(facets.tag[tag] || []));
+
+            if (lists.length === 0) {
+                matches = ids.map((_, i) => i);
+            } else {
+                lists.sort((a, b) => a.length - b.length);
+                matches = lists.reduce(intersect);
+            }
+
+            filterCount.textContent = matches.length + ' phrases';
+            results.replaceChildren();
+            shown = 0;
+            showMore();
+        }
+
+        categoryFilter.addEventListener('change', applyFilters);
+        difficultyFilter.addEventListener('change', applyFilters);
+        moreButton.addEventListener('click', showMore);
+        document.querySelectorAll('.tag-filter').forEach(button => {
+            button.addEventListener('click', function() {
+                const tag = button.dataset.tag;
+                if (selectedTags.has(tag)) { selectedTags.delete(tag); } else { selectedTags.add(tag); }
+                button.classList.toggle('active');
+                applyFilters();
             });
         });
+
+        fetch('facets.json')
+            .then(response => response.json())
+            .then(data => {
+                facets = data.facets;
+                ids = data.ids;
+                applyFilters();
+            });
     </script>
 </body>
 </html>
 """
 
+FACETS = ("tag", "difficulty", "category")
+DIFFICULTY_ORDER = ["beginner", "intermediate", "advanced"]
+API_VERSION = 1
+HEADER_INDEX_VERSION = 2
+# Category fields shown in a category page's header.
+# Local modules whose code shapes the output; see generator_signature().
+GENERATOR_MODULES = ("generate_site", "corpus", "media", "validate", "console")
+# Files and directories in docs/ produced from the phrases; see output_signature().
+GENERATED_OUTPUTS = ("categories", "tags", "api", "media", "facets.json")
+PAGE_HEADER_FIELDS = ("icon", "name_en", "name_zh", "parent_link", "subcategories")
+
+
+def page_name(slug: str) -> str:
+    """Turn a category slug into a flat file name: daily-life/transport -> daily-life--transport."""
+    return slug.replace("/", "--")
+
+
+def tag_slug(tag: str) -> str:
+    """Turn a tag into a file-name safe slug."""
+    slug = re.sub(r"[^a-z0-9]+", "-", str(tag).lower()).strip("-")
+    return slug or "tag"
+
+
+def tag_slugs(tags: Iterable[str]) -> dict[str, str]:
+    """Give every tag a unique slug, so no tag page overwrites another.
+
+    Tags that would share a slug ("food description", "food-description")
+    get a short hash of the tag appended, except one whose text already is
+    the slug, so page names do not move when a similar tag appears.
+    """
+    groups: dict[str, list[str]] = {}
+    for tag in sorted(set(tags)):
+        groups.setdefault(tag_slug(tag), []).append(tag)
+
+    slugs = {}
+    taken = set(groups)
+    for slug, members in groups.items():
+        for tag in members:
+            if len(members) == 1 or tag == slug:
+                slugs[tag] = slug
+                continue
+            digest = hashlib.sha1(tag.encode("utf-8")).hexdigest()
+            length = 6
+            while f"{slug}-{digest[:length]}" in taken:
+                length += 1
+            slugs[tag] = f"{slug}-{digest[:length]}"
+            taken.add(slugs[tag])
+    return slugs
+
+
+def build_facet_index(phrases: list[dict[str, Any]]) -> dict[str, dict[str, list[int]]]:
+    """Map each tag, difficulty and category to the sorted ids of its phrases.
+
+    Phrase ids are positions in ``phrases``, so every id list is sorted and
+    facets can be combined by intersecting the lists.
+    """
+    index: dict[str, dict[str, list[int]]] = {facet: {} for facet in FACETS}
+
+    for phrase_id, phrase in enumerate(phrases):
+        for tag in dict.fromkeys(phrase["tags"]):
+            index["tag"].setdefault(tag, []).append(phrase_id)
+        index["difficulty"].setdefault(phrase["difficulty"], []).append(phrase_id)
+        index["category"].setdefault(phrase["category"], []).append(phrase_id)
+
+    return index
+
 
-def load_category_metadata(category_dir: Path) -> dict[str, Any] | None:
-    """Load category metadata from _category.yaml."""
-    meta_file = category_dir / "_category.yaml"
-    if not meta_file.exists():
-        return None
+def page_facets(phrases: list[dict[str, Any]]) -> dict[str, dict[str, list[int]]]:
+    """Build the filter index embedded in a page, in display order."""
+    index = build_facet_index(phrases)
+    return {
+        "difficulty": {
+            difficulty: index["difficulty"][difficulty]
+            for difficulty in sorted(index["difficulty"], key=difficulty_rank)
+        },
+        "tag": dict(sorted(index["tag"].items())),
+    }
+
+
+def difficulty_rank(difficulty: str) -> tuple[int, str]:
+    """Sort key placing known difficulties in learning order."""
+    if difficulty in DIFFICULTY_ORDER:
+        return DIFFICULTY_ORDER.index(difficulty), ""
+    return len(DIFFICULTY_ORDER), difficulty
+
+
+def flatten_phrase(phrase: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a phrase entry into the fields the templates use.
+
+    Tags are strings even when YAML reads them as numbers (``- 2024``), so
+    they sort and serialise alongside the others.
+    """
+    tags = phrase.get("tags", [])
+    return {
+        "id": phrase.get("id", ""),
+        "phrase": phrase.get("phrase", ""),
+        "pronunciation": phrase.get("pronunciation", ""),
+        "meaning_en": phrase.get("meaning", {}).get("en", ""),
+        "meaning_zh": phrase.get("meaning", {}).get("zh", ""),
+        "context_en": phrase.get("context", {}).get("en", "") if isinstance(phrase.get("context"), dict) else "",
+        "context_zh": phrase.get("context", {}).get("zh", "") if isinstance(phrase.get("context"), dict) else "",
+        "cultural_note_en": phrase.get("cultural_note", {}).get("en", "") if isinstance(phrase.get("cultural_note"), dict) else "",
+        "cultural_note_zh": phrase.get("cultural_note", {}).get("zh", "") if isinstance(phrase.get("cultural_note"), dict) else "",
+        "examples": phrase.get("examples", []),
+        "difficulty": phrase.get("difficulty", "intermediate"),
+        "tags": [str(tag) for tag in tags] if isinstance(tags, list) else [],
+    }
+
+
+def page_phrase(
+    phrase: dict[str, Any], category: str, media_store: MediaStore | None
+) -> dict[str, Any]:
+    """Flatten a phrase for a page, with its category and media file names."""
+    media = media_store.resolve_phrase(phrase) if media_store else {}
+    return {
+        **flatten_phrase(phrase),
+        "category": category,
+        "audio": media.get("audio", ""),
+        "image": media.get("image", ""),
+    }
+
+
+def write_page(path: Path, html: str) -> None:
+    """Write a rendered page."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def encode_json(payload: Any) -> bytes:
+    """Serialise an API document canonically, so equal content hashes equal."""
+    return json.dumps(
+        payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """Write ``content`` unless the file already holds it. Returns True if written."""
+    try:
+        if path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+
+    path.write_bytes(content)
+    return True
+
+
+def remove_stale(directory: Path, keep: set[str]) -> None:
+    """Delete generated files in ``directory`` that are not in ``keep``."""
+    for path in directory.iterdir():
+        if path.is_file() and path.name not in keep:
+            path.unlink()
+
+
+def write_counted(path: Path, content: bytes, counts: dict[str, int]) -> None:
+    """Write a file if it changed, tallying it as written or unchanged."""
+    if write_if_changed(path, content):
+        counts["written"] += 1
+    else:
+        counts["unchanged"] += 1
+
+
+def write_api_shards(
+    api_dir: Path,
+    documents: dict[str, list[dict[str, Any]]],
+    counts: dict[str, int],
+    media_store: MediaStore | None = None,
+) -> dict[str, str]:
+    """Write one shard per category and one document per phrase.
+
+    Media references are replaced by the site paths of the media files.
+    Phrases whose id is not a safe file name, or repeats an earlier id, are
+    reported and get no phrase document; they stay in their category's
+    shard. Files are only rewritten when their content changes. Returns the
+    SHA-256 of each category's shard, for the manifest.
+    """
+    shards_dir = api_dir / "categories"
+    phrase_docs_dir = api_dir / "phrases"
+    shards_dir.mkdir(parents=True, exist_ok=True)
+    phrase_docs_dir.mkdir(exist_ok=True)
+
+    shard_hashes = {}
+    phrase_files = set()
+    id_categories: dict[str, str] = {}
+
+    for slug, raw_phrases in documents.items():
+        phrases = []
+        for raw_phrase in raw_phrases:
+            phrase = {**raw_phrase, "category": slug}
+            if "media" in phrase:
+                media = media_store.resolve_phrase(phrase) if media_store else {}
+                phrase["media"] = {kind: f"media/{name}" for kind, name in media.items()}
+            phrases.append(phrase)
+
+        shard = encode_json({"category": slug, "phrases": phrases})
+        write_counted(shards_dir / f"{page_name(slug)}.json", shard, counts)
+        shard_hashes[slug] = hashlib.sha256(shard).hexdigest()
+
+        for phrase in phrases:
+            phrase_id = phrase.get("id")
+            if not phrase_id:
+                continue
+            if not isinstance(phrase_id, str) or not PHRASE_ID_PATTERN.fullmatch(phrase_id):
+                console.error(
+                    f"  ERROR: {slug}: skipped API document for unsafe phrase id {phrase_id!r}",
+                    category=slug,
+                    id=str(phrase_id),
+                )
+                continue
+            if phrase_id in id_categories:
+                console.error(
+                    f"  ERROR: {slug}: skipped API document for duplicate phrase id "
+                    f"{phrase_id} (also in {id_categories[phrase_id]})",
+                    category=slug,
+                    id=phrase_id,
+                )
+                continue
+            id_categories[phrase_id] = slug
+            phrase_name = f"{phrase_id}.json"
+            write_counted(phrase_docs_dir / phrase_name, encode_json(phrase), counts)
+            phrase_files.add(phrase_name)
+
+    remove_stale(shards_dir, {f"{page_name(slug)}.json" for slug in documents})
+    remove_stale(phrase_docs_dir, phrase_files)
+
+    return shard_hashes
+
+
+def write_api_manifest(
+    api_dir: Path, categories: list[dict[str, Any]], counts: dict[str, int]
+) -> None:
+    """Write the API manifest listing every shard with its content hash.
+
+    Clients compare the hashes with their copy and only fetch shards that
+    changed. ``categories`` must be in display order.
+    """
+    manifest = {
+        "version": API_VERSION,
+        "phrase_url": "phrases/{id}.json",
+        "categories": [
+            {
+                "slug": category["slug"],
+                "parent": category["parent"],
+                "name": {"en": category["name_en"], "zh": category["name_zh"]},
+                "description": {"en": category["desc_en"], "zh": category["desc_zh"]},
+                "icon": category["icon"],
+                "order": category["order"],
+                "phrase_count": category["phrase_count"],
+                "url": f"categories/{category['page']}.json",
+                "hash": category["shard_hash"],
+            }
+            for category in categories
+        ],
+    }
+    write_counted(api_dir / "manifest.json", encode_json(manifest), counts)
+
+
+def file_signature(path: Path) -> dict[str, int]:
+    """Return the modification time and size used to spot changed files."""
+    stat = path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def scan_file(path: Path, previous: dict[str, Any] | None) -> tuple[dict[str, Any], Any]:
+    """Return a file's header entry and, if it had to be parsed, its data.
+
+    Files whose modification time and size are unchanged are not read;
+    files whose content hash is unchanged are read but not parsed.
+    """
+    signature = file_signature(path)
+    if previous and all(previous[key] == value for key, value in signature.items()):
+        return previous, None
+
+    content = path.read_bytes()
+    digest = hashlib.sha1(content).hexdigest()
+    if previous and previous["hash"] == digest:
+        return {**previous, **signature}, None
 
     try:
-        with open(meta_file, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        data = parse_yaml(content)
     except yaml.YAMLError:
-        return None
+        data = None
+    return {**signature, "hash": digest}, data
 
 
-def load_phrases_from_category(category_dir: Path) -> list[dict[str, Any]]:
-    """Load all phrases from a category directory."""
-    phrases = []
+def update_header_index(
+    phrases_dir: Path, previous: dict[str, Any]
+) -> tuple[dict[str, Any], dict[Path, list[dict[str, Any]]], bool]:
+    """Refresh the header index: category metadata, phrase and tag counts per file.
 
-    for yaml_file in category_dir.glob("*.yaml"):
-        if yaml_file.name == "_category.yaml":
+    Categories at every depth are indexed under their slug, e.g.
+    ``daily-life/transport``, and files under their path in the category,
+    so files in shard directories are included. Top-level directories
+    without _category.yaml and categories with unreadable metadata are
+    skipped with a warning.
+
+    Returns the new index, the phrases of every file that had to be parsed
+    (so they are not parsed twice), and whether any phrase content changed.
+    """
+    previous_categories = previous.get("categories", {})
+    categories = {}
+    parsed = {}
+    content_changed = False
+
+    def warn(path: Path, message: str) -> None:
+        console.error(f"Warning: Skipping {path}: {message}", file=str(path), error=message)
+
+    for category in scan_categories(phrases_dir, on_skip=warn):
+        old = previous_categories.get(category.slug, {})
+        meta_entry, meta = scan_file(category.meta_file, old.get("meta_file"))
+        if meta is None and "meta" in old and meta_entry["hash"] == old["meta_file"]["hash"]:
+            meta = old["meta"]
+        if not isinstance(meta, dict):
+            warn(category.path, f"{category.meta_file.name} is not a valid metadata mapping")
             continue
 
+        old_files = old.get("files", {})
+        files = {}
+        for yaml_file in category.files:
+            name = category.file_name(yaml_file)
+            entry, data = scan_file(yaml_file, old_files.get(name))
+            if "phrase_count" not in entry:
+                phrases = data.get("phrases") if isinstance(data, dict) else None
+                phrases = phrases if isinstance(phrases, list) else []
+                parsed[yaml_file] = phrases
+                tags: dict[str, int] = {}
+                for phrase in phrases:
+                    for tag in dict.fromkeys(flatten_phrase(phrase)["tags"]):
+                        tags[tag] = tags.get(tag, 0) + 1
+                entry = {**entry, "phrase_count": len(phrases), "tags": tags}
+            files[name] = entry
+
+        if {name: entry["hash"] for name, entry in files.items()} != {
+            name: entry["hash"] for name, entry in old_files.items()
+        }:
+            content_changed = True
+
+        categories[category.slug] = {
+            "meta_file": meta_entry,
+            "meta": meta,
+            "files": files,
+            "shard_hash": old.get("shard_hash", ""),
+        }
+
+    if set(categories) != set(previous_categories):
+        content_changed = True
+
+    return {"version": HEADER_INDEX_VERSION, "categories": categories}, parsed, content_changed
+
+
+def generator_signature() -> str:
+    """Hash the code, templates and API version that produce the site.
+
+    Covers this script and every local module it imports, including the
+    corpus scanner and the validator's id rules. Kept in the header index:
+    when the generator changes, pages rendered by the old code are rebuilt
+    even if no phrase changed.
+    """
+    digest = hashlib.sha256(f"api-{API_VERSION}\n".encode())
+    for module in GENERATOR_MODULES:
+        digest.update(Path(__file__).with_name(f"{module}.py").read_bytes())
+    return digest.hexdigest()
+
+
+def output_signature(docs_dir: Path) -> str:
+    """Hash the path, modification time and size of every generated file.
+
+    Kept in the header index: if a category or tag page, an API document,
+    a media file or facets.json was deleted or edited since the last build,
+    the pages are regenerated even if no phrase changed.
+    """
+    digest = hashlib.sha1()
+
+    def walk(path: Path, name: str) -> None:
         try:
-            with open(yaml_file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+            stat = path.stat()
+        except FileNotFoundError:
+            return
+        if not S_ISDIR(stat.st_mode):
+            digest.update(f"{name}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+            return
+        with os.scandir(path) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                walk(Path(entry.path), f"{name}/{entry.name}")
+
+    for name in GENERATED_OUTPUTS:
+        walk(docs_dir / name, name)
+    return digest.hexdigest()
+
+
+def load_header_index(index_path: Path) -> dict[str, Any]:
+    """Load the header index, or an empty one if missing or outdated."""
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return index if index.get("version") == HEADER_INDEX_VERSION else {}
+
+
+def category_summary(slug: str, entry: dict[str, Any]) -> dict[str, Any]:
+    """Build the template data for a category from its header index entry."""
+    meta = entry["meta"]
+    return {
+        "slug": slug,
+        "page": page_name(slug),
+        "parent": slug.rpartition("/")[0] or None,
+        "icon": meta.get("icon", "📁"),
+        "name_en": meta.get("name", {}).get("en", slug),
+        "name_zh": meta.get("name", {}).get("zh", ""),
+        "desc_en": meta.get("description", {}).get("en", ""),
+        "desc_zh": meta.get("description", {}).get("zh", ""),
+        "order": meta.get("order", 99),
+        "phrase_count": sum(f["phrase_count"] for f in entry["files"].values()),
+        "shard_hash": entry["shard_hash"],
+    }
+
+
+def link_categories(categories: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Connect category summaries to their parents and subcategories.
+
+    Sets each category's parent link, its subcategories in display order and
+    its total phrase count including subcategories. A category whose parent
+    has no metadata is shown at the top level. Returns the categories in
+    display order: each parent followed by its subcategories, by ``order``.
+    """
+    by_slug = {category["slug"]: category for category in categories}
+    children: dict[str | None, list[dict[str, Any]]] = {}
+
+    for category in categories:
+        if category["parent"] not in by_slug:
+            category["parent"] = None
+        children.setdefault(category["parent"], []).append(category)
+
+    for siblings in children.values():
+        siblings.sort(key=lambda x: x["order"])
+
+    ordered = []
+
+    def visit(category: dict[str, Any]) -> int:
+        ordered.append(category)
+        subcategories = children.get(category["slug"], [])
+        category["total_count"] = category["phrase_count"] + sum(map(visit, subcategories))
+        category["subcategories"] = [
+            {key: sub[key] for key in ("page", "icon", "name_en", "name_zh", "total_count")}
+            for sub in subcategories
+        ]
+        return category["total_count"]
+
+    for category in children.get(None, []):
+        visit(category)
+
+    for category in categories:
+        parent = by_slug.get(category["parent"])
+        category["parent_link"] = (
+            {key: parent[key] for key in ("page", "name_en")} if parent else None
+        )
+
+    return ordered
+
+
+def tag_counts(index: dict[str, Any]) -> dict[str, int]:
+    """Count the phrases per tag from the header index."""
+    counts: dict[str, int] = {}
+    for entry in index["categories"].values():
+        for file_entry in entry["files"].values():
+            for tag, count in file_entry["tags"].items():
+                counts[tag] = counts.get(tag, 0) + count
+    return counts
+
+
+def tag_summaries(counts: dict[str, int], slugs: dict[str, str]) -> list[dict[str, Any]]:
+    """Build the index page's tag links from the tag counts."""
+    return [
+        {"slug": slugs[tag], "name": tag, "phrase_count": count}
+        for tag, count in sorted(counts.items())
+    ]
+
+
+def load_category(
+    phrases_dir: Path,
+    slug: str,
+    entry: dict[str, Any],
+    parsed: dict[Path, list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Load a category's phrases, reusing files already parsed by the index.
+
+    The files come from the category's header index ``entry``, so the
+    directory is not listed again.
+    """
+    phrases = []
+    for name in entry["files"]:
+        yaml_file = phrases_dir / slug / name
+        if yaml_file in parsed:
+            phrases.extend(parsed[yaml_file])
+            continue
+        try:
+            data = read_yaml(yaml_file)
         except yaml.YAMLError:
             continue
-
         if data and "phrases" in data:
-            for phrase in data["phrases"]:
-                phrases.append({
-                    "phrase": phrase.get("phrase", ""),
-                    "pronunciation": phrase.get("pronunciation", ""),
-                    "meaning_en": phrase.get("meaning", {}).get("en", ""),
-                    "meaning_zh": phrase.get("meaning", {}).get("zh", ""),
-                    "context_en": phrase.get("context", {}).get("en", "") if isinstance(phrase.get("context"), dict) else "",
-                    "context_zh": phrase.get("context", {}).get("zh", "") if isinstance(phrase.get("context"), dict) else "",
-                    "cultural_note_en": phrase.get("cultural_note", {}).get("en", "") if isinstance(phrase.get("cultural_note"), dict) else "",
-                    "cultural_note_zh": phrase.get("cultural_note", {}).get("zh", "") if isinstance(phrase.get("cultural_note"), dict) else "",
-                    "examples": phrase.get("examples", []),
-                    "difficulty": phrase.get("difficulty", "intermediate"),
-                    "tags": phrase.get("tags", []),
-                })
-
+            phrases.extend(data["phrases"])
     return phrases
 
 
-def generate_site(phrases_dir: Path, docs_dir: Path) -> None:
-    """Generate the static site."""
-    docs_dir.mkdir(exist_ok=True)
+def render_category_page(
+    template: Template, categories_dir: Path, category: dict[str, Any], phrases: list[dict[str, Any]]
+) -> None:
+    """Render and write one category page."""
+    category_html = template.render(
+        category=category,
+        phrases=phrases,
+        facets=page_facets(phrases),
+    )
+
+    category_file = categories_dir / f"{category['page']}.html"
+    write_page(category_file, category_html)
+
+    if console.verbose:
+        console.detail(
+            f"  Generated: {category_file.name} ({len(phrases)} phrases)",
+            file=str(category_file),
+            phrases=len(phrases),
+        )
+
+
+def generate_pages(
+    phrases_dir: Path,
+    docs_dir: Path,
+    template: Template,
+    categories: list[dict[str, Any]],
+    entries: dict[str, dict[str, Any]],
+    parsed: dict[Path, list[dict[str, Any]]],
+    counts: dict[str, int],
+    media_store: MediaStore | None,
+    slugs: dict[str, str],
+) -> dict[str, str]:
+    """Generate every page that depends on phrase content.
+
+    Writes category pages, tag pages, facets.json, the API shards and the
+    media files, and returns the shard hashes.
+    """
     categories_dir = docs_dir / "categories"
-    categories_dir.mkdir(exist_ok=True)
+    tags_dir = docs_dir / "tags"
 
-    env = Environment(loader=FileSystemLoader("."))
+    all_phrases = []
+    documents = {}
 
-    categories = []
+    # Number phrases in scan order, so ids do not move when display order changes.
+    by_slug = {category["slug"]: category for category in categories}
+    for category in (by_slug[slug] for slug in entries):
+        documents[category["slug"]] = load_category(
+            phrases_dir, category["slug"], entries[category["slug"]], parsed
+        )
+        for phrase in documents[category["slug"]]:
+            all_phrases.append(page_phrase(phrase, category["slug"], media_store))
 
-    for category_dir in sorted(phrases_dir.iterdir()):
-        if not category_dir.is_dir():
-            continue
+    facet_index = build_facet_index(all_phrases)
 
-        meta = load_category_metadata(category_dir)
-        if not meta:
-            continue
+    for category in categories:
+        ids = facet_index["category"].get(category["slug"], [])
+        render_category_page(template, categories_dir, category, [all_phrases[i] for i in ids])
+
+    remove_stale(categories_dir, {f"{category['page']}.html" for category in categories})
 
-        phrases = load_phrases_from_category(category_dir)
+    tag_files = set()
 
-        category_data = {
-            "slug": category_dir.name,
-            "icon": meta.get("icon", "📁"),
-            "name_en": meta.get("name", {}).get("en", category_dir.name),
-            "name_zh": meta.get("name", {}).get("zh", ""),
-            "desc_en": meta.get("description", {}).get("en", ""),
-            "desc_zh": meta.get("description", {}).get("zh", ""),
-            "order": meta.get("order", 99),
-            "phrase_count": len(phrases),
+    for tag, ids in sorted(facet_index["tag"].items()):
+        phrases = [all_phrases[i] for i in ids]
+        tag_data = {
+            "slug": slugs[tag],
+            "icon": "🏷️",
+            "name_en": tag,
+            "name_zh": "标签",
         }
 
-        categories.append(category_data)
+        tag_html = template.render(
+            category=tag_data,
+            phrases=phrases,
+            facets=page_facets(phrases),
+        )
+        write_page(tags_dir / f"{tag_data['slug']}.html", tag_html)
+        tag_files.add(f"{tag_data['slug']}.html")
+
+    remove_stale(tags_dir, tag_files)
 
-        category_html = env.from_string(CATEGORY_TEMPLATE).render(
-            category=category_data,
-            phrases=phrases
+    console.info(f"  Generated: {len(categories)} category pages", pages=len(categories))
+    console.info(f"  Generated: {len(tag_files)} tag pages", pages=len(tag_files))
+
+    write_if_changed(
+        docs_dir / "facets.json",
+        encode_json({
+            "ids": [phrase["id"] for phrase in all_phrases],
+            "facets": facet_index,
+            "tag_slugs": slugs,
+        }),
+    )
+
+    console.info("  Generated: facets.json")
+
+    if media_store is not None:
+        copied = media_store.copy_to(docs_dir / "media", prune=True)
+        console.info(
+            f"  Generated: media/ ({len(media_store.files)} files, {copied} copied)",
+            files=len(media_store.files),
+            copied=copied,
+        )
+
+    return write_api_shards(docs_dir / "api", documents, counts, media_store)
+
+
+def generate_site(
+    phrases_dir: Path,
+    docs_dir: Path,
+    index_path: Path | None = None,
+    media_store: MediaStore | None = None,
+) -> None:
+    """Generate the static site.
+
+    With ``index_path``, a header index of category metadata and per-file
+    phrase counts is kept there between runs. Phrase files are then only
+    parsed when they changed, and a metadata-only change regenerates the
+    index page, the API manifest and at most the affected category pages.
+    A change to the generator itself, or a generated file that was deleted
+    or edited, rebuilds everything.
+
+    With ``media_store``, referenced media files are copied once each into
+    docs/media/ under their content-addressed names.
+    """
+    categories_dir = docs_dir / "categories"
+    categories_dir.mkdir(parents=True, exist_ok=True)
+    tags_dir = docs_dir / "tags"
+    tags_dir.mkdir(exist_ok=True)
+
+    previous = load_header_index(index_path) if index_path else {}
+    index, parsed, content_changed = update_header_index(phrases_dir, previous)
+    index["generator"] = generator_signature()
+    content_changed = content_changed or index["generator"] != previous.get("generator")
+    if media_store is not None:
+        index["media"] = media_signature(media_store.media_dir)
+        content_changed = content_changed or index["media"] != previous.get("media")
+
+    tags = tag_counts(index)
+    slugs = tag_slugs(tags)
+    env = Environment(loader=FileSystemLoader("."))
+    env.filters["tag_slug"] = lambda tag: slugs[tag]
+    category_template = env.from_string(CATEGORY_TEMPLATE)
+
+    categories = link_categories([
+        category_summary(slug, entry) for slug, entry in index["categories"].items()
+    ])
+    outputs_changed = output_signature(docs_dir) != previous.get("outputs")
+
+    counts = {"written": 0, "unchanged": 0}
+
+    if not previous or content_changed or outputs_changed:
+        shard_hashes = generate_pages(
+            phrases_dir,
+            docs_dir,
+            category_template,
+            categories,
+            index["categories"],
+            parsed,
+            counts,
+            media_store,
+            slugs,
         )
+        for category in categories:
+            category["shard_hash"] = shard_hashes[category["slug"]]
+            index["categories"][category["slug"]]["shard_hash"] = category["shard_hash"]
+    else:
+        # Only metadata changed: re-render the pages whose header changed.
+        old_categories = {
+            category["slug"]: category
+            for category in link_categories([
+                category_summary(slug, entry) for slug, entry in previous["categories"].items()
+            ])
+        }
+        for category in categories:
+            old = old_categories[category["slug"]]
+            if any(category[field] != old[field] for field in PAGE_HEADER_FIELDS):
+                entry = index["categories"][category["slug"]]
+                phrases = [
+                    page_phrase(phrase, category["slug"], media_store)
+                    for phrase in load_category(phrases_dir, category["slug"], entry, parsed)
+                ]
+                render_category_page(category_template, categories_dir, category, phrases)
+        console.info("  Phrases unchanged: reused category pages, tag pages and API shards")
 
-        category_file = categories_dir / f"{category_dir.name}.html"
-        with open(category_file, "w", encoding="utf-8") as f:
-            f.write(category_html)
+    write_api_manifest(docs_dir / "api", categories, counts)
+    console.info(
+        f"  Generated: api/ ({counts['written']} written, {counts['unchanged']} unchanged)",
+        written=counts["written"],
+        unchanged=counts["unchanged"],
+    )
 
-        print(f"  Generated: {category_file.name} ({len(phrases)} phrases)")
+    tag_list = tag_summaries(tags, slugs)
+    index_html = env.from_string(INDEX_TEMPLATE).render(categories=categories, tags=tag_list)
+    write_page(docs_dir / "index.html", index_html)
 
-    categories.sort(key=lambda x: x["order"])
+    console.info("  Generated: index.html")
 
-    index_html = env.from_string(INDEX_TEMPLATE).render(categories=categories)
+    filter_html = env.from_string(FILTER_TEMPLATE).render(
+        categories=categories,
+        difficulties=DIFFICULTY_ORDER,
+        tags=tag_list,
+        category_index={
+            category["slug"]: {"page": category["page"], "name_en": category["name_en"]}
+            for category in categories
+        },
+    )
+    write_page(docs_dir / "filter.html", filter_html)
 
-    index_file = docs_dir / "index.html"
-    with open(index_file, "w", encoding="utf-8") as f:
-        f.write(index_html)
+    console.info("  Generated: filter.html")
 
-    print(f"  Generated: index.html")
+    if index_path:
+        index["outputs"] = output_signature(docs_dir)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_bytes(encode_json(index))
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Main entry point."""
     script_dir = Path(__file__).parent
     project_dir = script_dir.parent
-    phrases_dir = project_dir / "phrases"
-    docs_dir = project_dir / "docs"
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--phrases-dir",
+        type=Path,
+        default=project_dir / "phrases",
+        help="directory containing the phrase categories",
+    )
+    parser.add_argument(
+        "--docs-dir",
+        type=Path,
+        default=project_dir / "docs",
+        help="directory to write the generated site into",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=project_dir / ".cache" / "site-index.json",
+        help="header index kept between runs to skip unchanged phrase files",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the header index and regenerate everything",
+    )
+    parser.add_argument(
+        "--media-dir",
+        type=Path,
+        default=project_dir / "media",
+        help="directory that phrase media references are relative to",
+    )
+    console_options.add_arguments(parser)
+    args = parser.parse_args(argv)
+    console_options.configure(args)
+    phrases_dir = args.phrases_dir
+    docs_dir = args.docs_dir
 
     if not phrases_dir.exists():
-        print(f"ERROR: Phrases directory not found: {phrases_dir}")
+        console.error(f"ERROR: Phrases directory not found: {phrases_dir}")
         return 1
 
-    print("Generating GitHub Pages site...")
-    generate_site(phrases_dir, docs_dir)
+    console.info("Generating GitHub Pages site...")
+    if args.full and args.index.exists():
+        args.index.unlink()
+    media_store = MediaStore(args.media_dir, project_dir / ".cache" / "media-hashes.json")
+    generate_site(phrases_dir, docs_dir, args.index, media_store)
+    media_store.save_cache()
 
-    print(f"\nSite generated in: {docs_dir}")
-    print("To preview locally, run:")
-    print(f"  cd {docs_dir} && python -m http.server")
+    console.info(
+        f"\nSite generated in: {docs_dir}\n"
+        "To preview locally, run:\n"
+        f"  cd {docs_dir} && python -m http.server",
+        output=str(docs_dir),
+    )
 
     return 0
 
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""Import phrases from a CSV or TSV spreadsheet into validated YAML files.
+
+Rows are streamed, mapped onto the phrase schema, given an id that is unique
+across the whole corpus, and checked with the same rules as validate.py.
+Valid rows are written to the category directory in files of at most
+``--batch-size`` phrases; invalid rows are reported and skipped.
+
+Default column names:
+
+    id, phrase, pronunciation, category, difficulty,
+    meaning_en, meaning_zh, context_en, context_zh,
+    cultural_note_en, cultural_note_zh,
+    example_en, example_zh, example2_en, example2_zh, ...,
+    tags, related_phrases (split on ';' or ',')
+
+Use ``--map COLUMN=FIELD`` when the spreadsheet uses other headings.
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterator
+
+import console as console_options
+import corpus
+from console import console
+from validate import validate_phrase
+
+FIELDS = {
+    "id", "phrase", "pronunciation", "category", "difficulty", "tags",
+    "related_phrases", "meaning_en", "meaning_zh", "context_en", "context_zh",
+    "cultural_note_en", "cultural_note_zh",
+}
+EXAMPLE_FIELD = re.compile(r"example(\d*)_(en|zh)")
+LIST_SEPARATOR = re.compile(r"\s*[;,]\s*")
+# Characters JSON leaves as they are but YAML does not allow unescaped, or
+# reads as line breaks. (Lone surrogates cannot occur: input is strict UTF-8.)
+NON_PRINTABLE = re.compile("[\x7f-\x9f\u2028\u2029\ufffe\uffff]")
+
+
+def slugify(text: str) -> str:
+    """Turn a phrase into an id: lowercase words joined by hyphens."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def quote(value: str) -> str:
+    """Quote a string as a YAML double-quoted scalar.
+
+    Only characters YAML cannot hold unescaped are escaped; escaping
+    everything non-ASCII would turn emoji into surrogate pairs, which YAML
+    reads back as two separate characters.
+    """
+    quoted = json.dumps(value, ensure_ascii=False)
+    return NON_PRINTABLE.sub(lambda match: f"\\u{ord(match[0]):04x}", quoted)
+
+
+def format_value(value: Any, indent: str) -> list[str]:
+    """Format a string, mapping or list as YAML lines at ``indent``.
+
+    Only the shapes used by phrase entries are supported: strings, and
+    mappings and lists nesting them.
+    """
+    lines = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, str):
+                lines.append(f"{indent}{key}: {quote(item)}")
+            else:
+                lines.append(f"{indent}{key}:")
+                lines.extend(format_value(item, indent + "  "))
+    else:
+        for item in value:
+            if isinstance(item, str):
+                lines.append(f"{indent}- {quote(item)}")
+            else:
+                item_lines = format_value(item, indent + "  ")
+                item_lines[0] = f"{indent}- {item_lines[0][len(indent) + 2:]}"
+                lines.extend(item_lines)
+    return lines
+
+
+def format_phrase_file(metadata: dict[str, str], phrases: list[dict[str, Any]]) -> str:
+    """Format a phrase file in the layout of the hand-written files.
+
+    PyYAML's representer is pure Python even with the libyaml dumper and
+    dominates large imports, so the known phrase shape is emitted directly.
+    """
+    lines = ["metadata:", *format_value(metadata, "  "), "", "phrases:"]
+    for phrase in phrases:
+        lines.extend(format_value([phrase], "  "))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def split_list(value: str) -> list[str]:
+    """Split a ';' or ',' separated cell into its non-empty items."""
+    return [item for item in LIST_SEPARATOR.split(value.strip()) if item]
+
+
+def parse_mapping(pairs: list[str]) -> dict[str, str]:
+    """Parse COLUMN=FIELD pairs from the command line."""
+    mapping = {}
+    for pair in pairs:
+        column, sep, field = pair.partition("=")
+        if not sep or not (field in FIELDS or EXAMPLE_FIELD.fullmatch(field)):
+            raise ValueError(f"Invalid column mapping: {pair}")
+        mapping[column] = field
+    return mapping
+
+
+def build_phrase(row: dict[str, str]) -> dict[str, Any]:
+    """Map a row keyed by schema field names onto a phrase entry."""
+    values = {key: value.strip() for key, value in row.items() if value and value.strip()}
+
+    phrase: dict[str, Any] = {}
+    for key in ("id", "phrase", "pronunciation"):
+        if key in values:
+            phrase[key] = values[key]
+
+    for key in ("meaning", "context", "cultural_note"):
+        pair = {lang: values[f"{key}_{lang}"] for lang in ("en", "zh") if f"{key}_{lang}" in values}
+        if pair:
+            phrase[key] = pair
+
+    examples: dict[int, dict[str, str]] = {}
+    for key, value in values.items():
+        match = EXAMPLE_FIELD.fullmatch(key)
+        if match:
+            number = int(match.group(1) or 1)
+            examples.setdefault(number, {})[match.group(2)] = value
+    if examples:
+        phrase["examples"] = [examples[number] for number in sorted(examples)]
+
+    if "related_phrases" in values:
+        phrase["related_phrases"] = split_list(values["related_phrases"])
+    if "difficulty" in values:
+        phrase["difficulty"] = values["difficulty"]
+    if "tags" in values:
+        phrase["tags"] = split_list(values["tags"])
+
+    return phrase
+
+
+def read_rows(
+    input_path: Path, mapping: dict[str, str], delimiter: str
+) -> Iterator[tuple[int, dict[str, str]]]:
+    """Stream rows as (line number, row keyed by schema field name)."""
+    with open(input_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        columns = {
+            column: mapping.get(column, column.strip().lower())
+            for column in reader.fieldnames or []
+        }
+        for row in reader:
+            yield reader.line_num, {
+                columns[column]: value
+                for column, value in row.items()
+                if column is not None and isinstance(value, str)
+            }
+
+
+class BatchWriter:
+    """Collect phrases per category and write them in fixed-size files."""
+
+    def __init__(self, phrases_dir: Path, name: str, batch_size: int, metadata: dict[str, str]):
+        self.phrases_dir = phrases_dir
+        self.name = name
+        self.batch_size = batch_size
+        self.metadata = metadata
+        self.pending: dict[str, list[dict[str, Any]]] = {}
+        self.next_number: dict[str, int] = {}
+        self.written: list[Path] = []
+
+    def add(self, category: str, phrase: dict[str, Any]) -> None:
+        """Queue a phrase, writing a file once the category's batch is full."""
+        batch = self.pending.setdefault(category, [])
+        batch.append(phrase)
+        if len(batch) >= self.batch_size:
+            self._write(category)
+
+    def close(self) -> None:
+        """Write every partially filled batch."""
+        for category in list(self.pending):
+            if self.pending[category]:
+                self._write(category)
+
+    def _write(self, category: str) -> None:
+        category_dir = self.phrases_dir / category
+        number = self.next_number.get(category, 1)
+        while (path := category_dir / f"{self.name}-{number:03d}.yaml").exists():
+            number += 1
+        self.next_number[category] = number + 1
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(format_phrase_file(self.metadata, self.pending[category]))
+
+        self.pending[category] = []
+        self.written.append(path)
+        if console.verbose:
+            console.detail(f"  Wrote: {category}/{path.name}", file=str(path))
+
+
+def import_rows(
+    rows: Iterator[tuple[int, dict[str, str]]],
+    phrases_dir: Path,
+    writer: BatchWriter | None,
+    default_category: str | None,
+) -> tuple[int, int]:
+    """Validate rows and hand valid phrases to ``writer``.
+
+    Returns (rows imported, rows rejected). With no writer, rows are only
+    checked.
+    """
+    known_ids = {phrase.get("id") for _, phrase in corpus.load_phrases(phrases_dir)}
+    categories = {category.slug for category in corpus.scan_categories(phrases_dir)}
+    imported = rejected = 0
+
+    for line, row in rows:
+        category = row.pop("category", "").strip() or default_category
+        phrase = build_phrase(row)
+
+        if "id" in phrase:
+            if phrase["id"] in known_ids:
+                phrase_errors = [f"[{phrase['id']}] Duplicate phrase ID"]
+            else:
+                phrase_errors = []
+        else:
+            base = slugify(phrase.get("phrase", "")) or "phrase"
+            phrase_id, suffix = base, 2
+            while phrase_id in known_ids:
+                phrase_id, suffix = f"{base}-{suffix}", suffix + 1
+            phrase = {"id": phrase_id, **phrase}
+            phrase_errors = []
+
+        phrase_errors += validate_phrase(phrase, line)
+        if not category:
+            phrase_errors.append(f"[{phrase['id']}] Missing category")
+        elif category not in categories:
+            phrase_errors.append(f"[{phrase['id']}] Unknown category: {category}")
+
+        if phrase_errors:
+            for error in phrase_errors:
+                console.error(f"  ERROR: line {line}: {error}", line=line, error=error)
+            rejected += 1
+            continue
+
+        known_ids.add(phrase["id"])
+        if writer is not None:
+            writer.add(category, phrase)
+        imported += 1
+
+    if writer is not None:
+        writer.close()
+
+    return imported, rejected
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    script_dir = Path(__file__).parent
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("input", type=Path, help="CSV or TSV file to import")
+    parser.add_argument(
+        "--phrases-dir",
+        type=Path,
+        default=script_dir.parent / "phrases",
+        help="directory containing the phrase categories",
+    )
+    parser.add_argument(
+        "--category",
+        help="category for rows without a 'category' column value "
+        "(subcategories as e.g. daily-life/transport)",
+    )
+    parser.add_argument(
+        "--map",
+        action="append",
+        default=[],
+        metavar="COLUMN=FIELD",
+        help="map a spreadsheet column onto a phrase field",
+    )
+    parser.add_argument(
+        "--delimiter",
+        help="field delimiter (default: tab for .tsv files, comma otherwise)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="maximum number of phrases per written YAML file",
+    )
+    parser.add_argument(
+        "--name",
+        help="file name prefix for written files (default: input file name)",
+    )
+    parser.add_argument(
+        "--source",
+        help="metadata.source for written files (default: input file name)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="validate the rows without writing any files",
+    )
+    console_options.add_arguments(parser)
+    args = parser.parse_args(argv)
+    console_options.configure(args)
+
+    if not args.phrases_dir.exists():
+        console.error(f"ERROR: Phrases directory not found: {args.phrases_dir}")
+        return 1
+
+    if not args.input.exists():
+        console.error(f"ERROR: Input file not found: {args.input}")
+        return 1
+
+    if args.batch_size < 1:
+        console.error("ERROR: --batch-size must be at least 1")
+        return 1
+
+    try:
+        mapping = parse_mapping(args.map)
+    except ValueError as e:
+        console.error(f"ERROR: {e}")
+        return 1
+
+    delimiter = args.delimiter or ("\t" if args.input.suffix.lower() == ".tsv" else ",")
+
+    writer = None
+    if not args.dry_run:
+        metadata = {
+            "source": args.source or args.input.name,
+            "date_added": date.today().isoformat(),
+        }
+        writer = BatchWriter(
+            args.phrases_dir,
+            args.name or slugify(args.input.stem) or "import",
+            args.batch_size,
+            metadata,
+        )
+
+    console.info(f"Importing {args.input}...")
+    rows = read_rows(args.input, mapping, delimiter)
+    imported, rejected = import_rows(rows, args.phrases_dir, writer, args.category)
+
+    counts = {"Rows imported": imported, "Rows rejected": rejected}
+    if writer is not None:
+        counts["Files written"] = len(writer.written)
+    console.summary(counts)
+
+    if rejected > 0:
+        console.error("\nImport finished with rejected rows")
+        return 1
+
+    console.info("\nImport PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
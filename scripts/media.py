@@ -0,0 +1,198 @@
+"""Content-addressed media files shared by the Anki deck and the site.
+
+Phrases may reference local audio and image files:
+
+    media:
+      audio: "give-way.mp3"
+      image: "signs/give-way.jpg"
+
+References are paths relative to the media directory. Each file is named
+after a hash of its content, so a file used by many phrases is packed and
+copied once. Hashes are cached by modification time and size, so unchanged
+files are not read again.
+"""
+
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Any
+
+MEDIA_KINDS = {
+    "audio": {".mp3", ".ogg", ".wav", ".m4a"},
+    "image": {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"},
+}
+
+HASH_LENGTH = 16
+# Names given to copies by ``MediaStore``: the only files pruning may remove.
+HASHED_NAME = re.compile(rf"[0-9a-f]{{{HASH_LENGTH}}}\.[a-z0-9]+")
+
+
+def is_inside(reference: str) -> bool:
+    """Whether a reference is a relative path that stays in the media directory."""
+    path = Path(reference)
+    return not path.is_absolute() and ".." not in path.parts
+
+
+def validate_media(phrase: dict[str, Any], media_dir: Path | None = None) -> list[str]:
+    """Validate a phrase's optional media references.
+
+    With ``media_dir``, also check that the referenced files exist.
+    """
+    errors = []
+    phrase_id = phrase.get("id", "unknown")
+    media = phrase.get("media")
+
+    if media is None:
+        return errors
+
+    if not isinstance(media, dict):
+        return [f"[{phrase_id}] 'media' must be a mapping"]
+
+    for kind, reference in media.items():
+        if kind not in MEDIA_KINDS:
+            errors.append(
+                f"[{phrase_id}] Unknown media type: {kind}. "
+                f"Must be one of: {', '.join(MEDIA_KINDS)}"
+            )
+            continue
+
+        if not isinstance(reference, str) or not reference:
+            errors.append(f"[{phrase_id}] media.{kind} must be a file name")
+            continue
+
+        if not is_inside(reference):
+            errors.append(
+                f"[{phrase_id}] media.{kind} must stay inside the media directory: {reference}"
+            )
+        elif Path(reference).suffix.lower() not in MEDIA_KINDS[kind]:
+            errors.append(
+                f"[{phrase_id}] media.{kind} has an unsupported file type: {reference}"
+            )
+        elif media_dir is not None and not (media_dir / reference).is_file():
+            errors.append(f"[{phrase_id}] media.{kind} file not found: {reference}")
+
+    return errors
+
+
+class MediaStore:
+    """Resolve media references to content-addressed file names."""
+
+    def __init__(self, media_dir: Path, cache_path: Path | None = None):
+        self.media_dir = media_dir
+        self.cache_path = cache_path
+        self.files: dict[str, Path] = {}
+        self._names: dict[str, str | None] = {}
+        self._cache: dict[str, dict[str, Any]] = {}
+
+        if cache_path is not None:
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    self._cache = json.load(f)
+            except (FileNotFoundError, ValueError):
+                self._cache = {}
+
+    def resolve(self, reference: str) -> str | None:
+        """Return the content-addressed name of a referenced file.
+
+        Returns None when the file does not exist.
+        """
+        if reference in self._names:
+            return self._names[reference]
+
+        if not is_inside(reference):
+            self._names[reference] = None
+            return None
+
+        path = self.media_dir / reference
+        try:
+            stat = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            self._names[reference] = None
+            return None
+
+        key = str(path.resolve())
+        cached = self._cache.get(key)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            digest = cached["sha256"]
+        else:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            self._cache[key] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+            }
+
+        name = digest[:HASH_LENGTH] + path.suffix.lower()
+        self.files.setdefault(name, path)
+        self._names[reference] = name
+        return name
+
+    def resolve_phrase(self, phrase: dict[str, Any]) -> dict[str, str]:
+        """Resolve a phrase's media references, skipping invalid ones."""
+        media = phrase.get("media")
+        if not isinstance(media, dict):
+            return {}
+
+        resolved = {}
+        for kind, reference in media.items():
+            if kind in MEDIA_KINDS and isinstance(reference, str):
+                name = self.resolve(reference)
+                if name is not None:
+                    resolved[kind] = name
+        return resolved
+
+    def copy_to(self, target_dir: Path, prune: bool = False) -> int:
+        """Copy every resolved file into ``target_dir`` under its hashed name.
+
+        Files already there are skipped: the same name means the same
+        content. With ``prune``, hashed copies no longer referenced are
+        removed; files with any other name are always left alone.
+        Returns the number of files copied.
+        """
+        if not self.files and not target_dir.exists():
+            return 0
+
+        target_dir.mkdir(parents=True, exist_ok=True)
+        copied = 0
+
+        for name, source in self.files.items():
+            target = target_dir / name
+            if not target.exists():
+                shutil.copyfile(source, target)
+                copied += 1
+
+        if prune:
+            for path in target_dir.iterdir():
+                if (
+                    path.is_file()
+                    and path.name not in self.files
+                    and HASHED_NAME.fullmatch(path.name)
+                ):
+                    path.unlink()
+
+        return copied
+
+    def save_cache(self) -> None:
+        """Persist the hash cache, if the store has one."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(self._cache, f, sort_keys=True)
+
+
+def media_signature(media_dir: Path) -> dict[str, list[int]]:
+    """Return (mtime, size) of every file in the media directory.
+
+    Lets incremental builds notice media changes without hashing.
+    """
+    if not media_dir.is_dir():
+        return {}
+    signature = {}
+    for path in media_dir.rglob("*"):
+        if path.is_file():
+            stat = path.stat()
+            signature[path.relative_to(media_dir).as_posix()] = [stat.st_mtime_ns, stat.st_size]
+    return dict(sorted(signature.items()))
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Flag likely mistranslated or truncated Chinese text across the corpus.
+
+An optional pass to run after validation. Every en/zh pair in ``meaning``,
+``context``, ``cultural_note`` and ``examples`` is turned into features held
+in NumPy arrays: lengths, CJK character counts, and counts of digits,
+question marks and exclamation marks. Pairs are flagged when the zh side
+has no Chinese characters, when numbers or punctuation do not match, or
+when the zh/en length ratio is a statistical outlier for its field.
+
+Requires NumPy (``pip install numpy``).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any
+
+import console as console_options
+import corpus
+from console import console
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TEXT_FIELDS = ("meaning", "context", "cultural_note")
+
+# Robust z-score above which a length ratio counts as an outlier.
+OUTLIER_THRESHOLD = 3.5
+# Fields with fewer pairs than this are too small to have outliers.
+MIN_FIELD_SIZE = 20
+
+CJK_RANGES = [
+    (0x3400, 0x4DBF),
+    (0x4E00, 0x9FFF),
+    (0xF900, 0xFAFF),
+    (0x20000, 0x2A6DF),
+]
+
+
+def collect_pairs(
+    phrases: list[tuple[str, dict[str, Any]]]
+) -> tuple[list[str], list[str], list[str], list[str]]:
+    """Gather every en/zh text pair as parallel lists.
+
+    Returns (en texts, zh texts, field names, locations), where a location
+    reads like ``daily-life/give-way examples[2]``.
+    """
+    en_texts, zh_texts, fields, locations = [], [], [], []
+
+    def add(en: Any, zh: Any, field: str, location: str) -> None:
+        if isinstance(en, str) and isinstance(zh, str):
+            en_texts.append(en)
+            zh_texts.append(zh)
+            fields.append(field)
+            locations.append(location)
+
+    for category, phrase in phrases:
+        name = f"{category}/{phrase.get('id', '?')}"
+
+        for field in TEXT_FIELDS:
+            value = phrase.get(field)
+            if isinstance(value, dict):
+                add(value.get("en"), value.get("zh"), field, f"{name} {field}")
+
+        examples = phrase.get("examples")
+        if isinstance(examples, list):
+            for i, example in enumerate(examples):
+                if isinstance(example, dict):
+                    add(example.get("en"), example.get("zh"), "examples", f"{name} examples[{i + 1}]")
+
+    return en_texts, zh_texts, fields, locations
+
+
+def count_matching(texts: list[str], predicate) -> "np.ndarray":
+    """Count, per text, the characters whose code point satisfies ``predicate``.
+
+    All texts are decoded into one code point array; per-text counts come
+    from differences of a cumulative sum at the text boundaries.
+    """
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    code_points = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    cumulative = np.concatenate(([0], np.cumsum(predicate(code_points), dtype=np.int64)))
+    ends = np.cumsum(lengths)
+    return cumulative[ends] - cumulative[ends - lengths]
+
+
+def is_cjk(code_points: "np.ndarray") -> "np.ndarray":
+    """Mask of CJK ideographs."""
+    mask = np.zeros(code_points.shape, dtype=bool)
+    for low, high in CJK_RANGES:
+        mask |= (code_points >= low) & (code_points <= high)
+    return mask
+
+
+def is_digit(code_points: "np.ndarray") -> "np.ndarray":
+    """Mask of ASCII and full-width digits."""
+    return ((code_points >= 0x30) & (code_points <= 0x39)) | (
+        (code_points >= 0xFF10) & (code_points <= 0xFF19)
+    )
+
+
+def is_question(code_points: "np.ndarray") -> "np.ndarray":
+    """Mask of ASCII and full-width question marks."""
+    return (code_points == ord("?")) | (code_points == ord("？"))
+
+
+def is_exclamation(code_points: "np.ndarray") -> "np.ndarray":
+    """Mask of ASCII and full-width exclamation marks."""
+    return (code_points == ord("!")) | (code_points == ord("！"))
+
+
+def length_outliers(
+    en_lengths: "np.ndarray", zh_cjk: "np.ndarray", field_ids: "np.ndarray"
+) -> "np.ndarray":
+    """Robust z-scores of the zh/en length ratio within each field.
+
+    Uses the median and median absolute deviation, so a handful of bad
+    translations cannot hide by inflating the spread. Fields that are too
+    small or have no spread score zero.
+    """
+    ratio = np.log((zh_cjk + 1) / (en_lengths + 1))
+    scores = np.zeros(ratio.shape)
+
+    for field_id in np.unique(field_ids):
+        members = field_ids == field_id
+        if members.sum() < MIN_FIELD_SIZE:
+            continue
+        values = ratio[members]
+        median = np.median(values)
+        mad = np.median(np.abs(values - median))
+        if mad == 0:
+            continue
+        scores[members] = 0.6745 * (values - median) / mad
+
+    return scores
+
+
+def check_pairs(
+    en_texts: list[str], zh_texts: list[str], fields: list[str]
+) -> list[tuple[int, str]]:
+    """Return (pair index, problem) for every flagged pair."""
+    if not en_texts:
+        return []
+
+    en_lengths = np.fromiter(map(len, en_texts), dtype=np.int64, count=len(en_texts))
+    zh_lengths = np.fromiter(map(len, zh_texts), dtype=np.int64, count=len(zh_texts))
+    zh_cjk = count_matching(zh_texts, is_cjk)
+    en_digits = count_matching(en_texts, is_digit)
+    zh_digits = count_matching(zh_texts, is_digit)
+    en_questions = count_matching(en_texts, is_question)
+    zh_questions = count_matching(zh_texts, is_question)
+    en_exclamations = count_matching(en_texts, is_exclamation)
+    zh_exclamations = count_matching(zh_texts, is_exclamation)
+
+    _, field_ids = np.unique(np.array(fields), return_inverse=True)
+    scores = length_outliers(en_lengths, zh_cjk, field_ids)
+
+    checks = [
+        ((zh_lengths > 0) & (zh_cjk == 0), "zh has no Chinese characters"),
+        ((en_lengths > 0) & (zh_lengths == 0), "zh is empty"),
+        (en_digits != zh_digits, "digits differ between en and zh"),
+        ((en_questions > 0) != (zh_questions > 0), "question marks differ between en and zh"),
+        ((en_exclamations > 0) != (zh_exclamations > 0), "exclamation marks differ between en and zh"),
+        (scores < -OUTLIER_THRESHOLD, "zh unusually short for its field (truncated?)"),
+        (scores > OUTLIER_THRESHOLD, "zh unusually long for its field"),
+    ]
+
+    problems = []
+    for mask, problem in checks:
+        for index in np.flatnonzero(mask):
+            problems.append((int(index), problem))
+
+    problems.sort()
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    script_dir = Path(__file__).parent
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--phrases-dir",
+        type=Path,
+        default=script_dir.parent / "phrases",
+        help="directory containing the phrase categories",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="exit with an error when any pair is flagged",
+    )
+    console_options.add_arguments(parser)
+    args = parser.parse_args(argv)
+    console_options.configure(args)
+
+    if np is None:
+        console.error("ERROR: The quality check requires NumPy: pip install numpy")
+        return 1
+
+    if not args.phrases_dir.exists():
+        console.error(f"ERROR: Phrases directory not found: {args.phrases_dir}")
+        return 1
+
+    console.info("Checking bilingual consistency...")
+    en_texts, zh_texts, fields, locations = collect_pairs(corpus.load_phrases(args.phrases_dir))
+    problems = check_pairs(en_texts, zh_texts, fields)
+
+    for index, problem in problems:
+        console.warning(
+            f"  WARNING: {locations[index]}: {problem}",
+            location=locations[index],
+            problem=problem,
+        )
+
+    flagged = len({index for index, _ in problems})
+    console.summary({"Pairs checked": len(en_texts), "Pairs flagged": flagged})
+
+    if problems and args.strict:
+        console.error("\nQuality check FAILED")
+        return 1
+
+    console.info("\nQuality check finished")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""Serve phrase lookups as JSON over HTTP from an in-memory index.
+
+Endpoints (GET or HEAD):
+
+    /phrases/<id>        a single phrase
+    /categories          category metadata and phrase counts
+    /categories/<slug>   the phrases of a category (e.g. daily-life/transport)
+    /tags                tag names and phrase counts
+    /tags/<tag>          the phrases with a tag
+
+Built on asyncio and the shared corpus loader only. Responses are cached in
+an LRU cache with content-hash ETags, and changed phrase files are picked up
+without a restart; only the files that changed are parsed again.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+import yaml
+
+import console as console_options
+import corpus
+from console import console
+
+MAX_HEADER_BYTES = 64 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+class PhraseIndex:
+    """The corpus indexed by phrase id, tag and category.
+
+    Built from already parsed files, keyed by path, so a reload only has to
+    parse the files that changed.
+    """
+
+    def __init__(self, categories: list[corpus.Category], documents: dict[Path, Any]):
+        self.by_id: dict[str, dict[str, Any]] = {}
+        self.by_tag: dict[str, list[str]] = {}
+        self.by_category: dict[str, list[str]] = {}
+        self.categories: dict[str, dict[str, Any]] = {}
+
+        for category in categories:
+            meta = documents.get(category.meta_file)
+            self.categories[category.slug] = meta if isinstance(meta, dict) else {}
+            self.by_category[category.slug] = []
+
+            for yaml_file in category.files:
+                data = documents.get(yaml_file)
+                phrases = data.get("phrases") if isinstance(data, dict) else None
+
+                for phrase in phrases if isinstance(phrases, list) else []:
+                    # Half-edited files can hold entries that are not phrases.
+                    if not isinstance(phrase, dict):
+                        continue
+                    phrase_id = phrase.get("id")
+                    if not isinstance(phrase_id, str) or not phrase_id:
+                        continue
+
+                    self.by_id[phrase_id] = {**phrase, "category": category.slug}
+                    self.by_category[category.slug].append(phrase_id)
+                    tags = phrase.get("tags") or []
+                    for tag in dict.fromkeys(map(str, tags if isinstance(tags, list) else [])):
+                        self.by_tag.setdefault(tag, []).append(phrase_id)
+
+    def category_summaries(self) -> list[dict[str, Any]]:
+        """Return metadata and phrase counts for every category."""
+        return [
+            {
+                "slug": slug,
+                "parent": slug.rpartition("/")[0] or None,
+                "name": meta.get("name", {}),
+                "description": meta.get("description", {}),
+                "icon": meta.get("icon", ""),
+                "order": meta.get("order", 99),
+                "phrase_count": len(self.by_category[slug]),
+            }
+            for slug, meta in self.categories.items()
+        ]
+
+
+class LRUCache:
+    """A fixed-size least-recently-used cache."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """Return a cached value and mark it as recently used."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def snapshot(phrases_dir: Path) -> tuple[list[corpus.Category], dict[Path, tuple[int, int]]]:
+    """Return the categories and (mtime, size) for every YAML file in them."""
+    files = {}
+    try:
+        categories = corpus.scan_categories(phrases_dir)
+    except FileNotFoundError:
+        return [], files
+
+    yaml_files = []
+    for category in categories:
+        yaml_files.append(category.meta_file)
+        yaml_files.extend(category.files)
+
+    for yaml_file in yaml_files:
+        try:
+            stat = yaml_file.stat()
+        except FileNotFoundError:
+            continue
+        files[yaml_file] = (stat.st_mtime_ns, stat.st_size)
+    return categories, files
+
+
+def render(payload: Any) -> tuple[bytes, str]:
+    """Serialise a JSON response and compute its ETag."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    return body, etag
+
+
+class PhraseService:
+    """Resolve request paths against the index, with caching and hot reload."""
+
+    def __init__(self, phrases_dir: Path, cache_size: int = 1024):
+        self.phrases_dir = phrases_dir
+        self.cache = LRUCache(cache_size)
+        self.files: dict[Path, tuple[int, int]] = {}
+        self.documents: dict[Path, Any] = {}
+        self.index = PhraseIndex([], {})
+
+        changes = self.load_changes()
+        if changes is not None:
+            self.swap(*changes)
+
+    def lookup(self, path: str) -> tuple[int, Any]:
+        """Return the status and JSON payload for a request path."""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+
+        if parts == ["categories"]:
+            return 200, {"categories": self.index.category_summaries()}
+
+        if parts == ["tags"]:
+            tags = {tag: len(ids) for tag, ids in sorted(self.index.by_tag.items())}
+            return 200, {"tags": tags}
+
+        if len(parts) > 2 and parts[0] == "categories":
+            # Subcategory slugs contain slashes: /categories/daily-life/transport
+            parts = ["categories", "/".join(parts[1:])]
+
+        if len(parts) == 2:
+            kind, key = parts
+            if kind == "phrases" and key in self.index.by_id:
+                return 200, self.index.by_id[key]
+            if kind == "categories" and key in self.index.by_category:
+                ids = self.index.by_category[key]
+                return 200, {
+                    "category": key,
+                    "phrases": [self.index.by_id[i] for i in ids],
+                }
+            if kind == "tags" and key in self.index.by_tag:
+                ids = self.index.by_tag[key]
+                return 200, {"tag": key, "phrases": [self.index.by_id[i] for i in ids]}
+
+        return 404, {"error": f"Not found: {path}"}
+
+    def respond(self, path: str) -> tuple[int, bytes, str]:
+        """Return status, body and ETag for a path, using the response cache."""
+        cached = self.cache.get(path)
+        if cached is not None:
+            return cached
+
+        status, payload = self.lookup(path)
+        body, etag = render(payload)
+        response = (status, body, etag)
+        if status == 200:
+            self.cache.put(path, response)
+        return response
+
+    def load_changes(
+        self,
+    ) -> tuple[dict[Path, tuple[int, int]], dict[Path, Any], PhraseIndex] | None:
+        """Reparse the files that changed since the last check and re-index.
+
+        Files whose (mtime, size) is unchanged keep their parsed data. A file
+        that no longer parses, e.g. half-way through an edit, keeps its last
+        good version until it is fixed, and the error is reported once.
+
+        Safe to run in a worker thread; the result is applied with ``swap``.
+        """
+        categories, files = snapshot(self.phrases_dir)
+        if files == self.files:
+            return None
+
+        documents = {}
+        for path, signature in files.items():
+            if self.files.get(path) == signature:
+                if path in self.documents:
+                    documents[path] = self.documents[path]
+                continue
+
+            try:
+                documents[path] = corpus.read_yaml(path)
+            except FileNotFoundError:
+                continue
+            except (yaml.YAMLError, UnicodeDecodeError) as e:
+                if path in self.documents:
+                    documents[path] = self.documents[path]
+                    kept = "keeping its last good version"
+                else:
+                    kept = "skipping it"
+                console.error(f"Warning: Cannot parse {path}, {kept}: {e}", file=str(path), error=str(e))
+
+        return files, documents, PhraseIndex(categories, documents)
+
+    def swap(
+        self, files: dict[Path, tuple[int, int]], documents: dict[Path, Any], index: PhraseIndex
+    ) -> None:
+        """Replace the parsed files and the index, and drop every cached response."""
+        self.files = files
+        self.documents = documents
+        self.index = index
+        self.cache.clear()
+
+
+def format_response(
+    status: int, body: bytes, headers: dict[str, str], include_body: bool
+) -> bytes:
+    """Build a raw HTTP/1.1 response."""
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+    headers = {"Content-Length": str(len(body)), **headers}
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head + body if include_body else head
+
+
+async def handle_connection(
+    service: PhraseService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Serve requests on one connection until the client closes it."""
+    try:
+        while True:
+            try:
+                request = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError:
+                writer.write(format_response(400, b"", {"Connection": "close"}, False))
+                break
+            except asyncio.IncompleteReadError:
+                break
+
+            request_line, *header_lines = request.decode("latin-1").split("\r\n")
+            headers = {}
+            for line in header_lines:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            try:
+                method, target, version = request_line.split(" ")
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                writer.write(format_response(400, b"", {"Connection": "close"}, False))
+                break
+
+            if length:
+                await reader.readexactly(length)
+
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            response_headers = {
+                "Content-Type": "application/json; charset=utf-8",
+                "Connection": "keep-alive" if keep_alive else "close",
+            }
+
+            if method not in ("GET", "HEAD"):
+                status, body, etag = 405, b"", ""
+                response_headers["Allow"] = "GET, HEAD"
+            else:
+                status, body, etag = service.respond(urlsplit(target).path)
+                response_headers["ETag"] = etag
+                response_headers["Cache-Control"] = "no-cache"
+                if status == 200 and headers.get("if-none-match") == etag:
+                    status, body = 304, b""
+
+            writer.write(format_response(status, body, response_headers, method != "HEAD"))
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def watch(service: PhraseService, interval: float) -> None:
+    """Poll the phrase files and reload the index when they change.
+
+    A failed reload is reported and the previous index kept; polling goes
+    on, so the next save is picked up.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            changes = await asyncio.to_thread(service.load_changes)
+        except Exception as e:
+            console.error(
+                f"ERROR: Reload failed, still serving the previous index: {e!r}",
+                error=repr(e),
+            )
+            console.flush()
+            continue
+        if changes is not None:
+            service.swap(*changes)
+            console.info(f"Reloaded: {len(service.index.by_id)} phrases", phrases=len(service.index.by_id))
+            console.flush()
+
+
+async def serve(service: PhraseService, host: str, port: int, reload_interval: float) -> None:
+    """Run the HTTP server until cancelled."""
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w),
+        host,
+        port,
+        limit=MAX_HEADER_BYTES,
+    )
+    console.info(
+        f"Serving {len(service.index.by_id)} phrases on http://{host}:{port}",
+        phrases=len(service.index.by_id),
+        url=f"http://{host}:{port}",
+    )
+    console.flush()
+
+    watcher = asyncio.create_task(watch(service, reload_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point."""
+    script_dir = Path(__file__).parent
+
+    parser = argparse.ArgumentParser(
+        description="Serve phrase lookups as JSON over HTTP from an in-memory index."
+    )
+    parser.add_argument(
+        "--phrases-dir",
+        type=Path,
+        default=script_dir.parent / "phrases",
+        help="directory containing the phrase categories",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="number of rendered responses to keep in the LRU cache",
+    )
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=1.0,
+        help="seconds between checks for changed phrase files",
+    )
+    console_options.add_arguments(parser)
+    args = parser.parse_args(argv)
+    console_options.configure(args)
+
+    if not args.phrases_dir.exists():
+        console.error(f"ERROR: Phrases directory not found: {args.phrases_dir}")
+        return 1
+
+    service = PhraseService(args.phrases_dir, args.cache_size)
+
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.reload_interval))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,37 @@
 #!/usr/bin/env python3
 """Validate YAML phrase files for required fields and structure."""
 
+import argparse
+import re
 import sys
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+import console as console_options
+import corpus
+from console import console
+from media import validate_media
+
 REQUIRED_PHRASE_FIELDS = {"id", "phrase", "meaning", "examples", "difficulty", "tags"}
 REQUIRED_MEANING_FIELDS = {"en", "zh"}
 VALID_DIFFICULTIES = {"beginner", "intermediate", "advanced"}
 REQUIRED_CATEGORY_FIELDS = {"name", "description", "icon", "order"}
+# Ids name files in the site's JSON API, so they must be safe as file names.
+PHRASE_ID_PATTERN = re.compile(r"[a-z0-9-]+")
 
 
 def load_yaml(file_path: Path) -> dict[str, Any] | None:
     """Load and parse a YAML file."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        return corpus.read_yaml(file_path)
     except yaml.YAMLError as e:
-        print(f"  ERROR: Invalid YAML syntax in {file_path}")
-        print(f"         {e}")
+        console.error(
+            f"  ERROR: Invalid YAML syntax in {file_path}\n         {e}",
+            file=str(file_path),
+            error=str(e),
+        )
         return None
 
 
@@ -47,8 +58,13 @@ def validate_category(file_path: Path, data: dict[str, Any]) -> list[str]:
     return errors
 
 
-def validate_phrase(phrase: dict[str, Any], phrase_index: int) -> list[str]:
-    """Validate a single phrase entry."""
+def validate_phrase(
+    phrase: dict[str, Any], phrase_index: int, media_dir: Path | None = None
+) -> list[str]:
+    """Validate a single phrase entry.
+
+    With ``media_dir``, referenced media files must exist there.
+    """
     errors = []
     phrase_id = phrase.get("id", f"index-{phrase_index}")
 
@@ -56,6 +72,13 @@ def validate_phrase(phrase: dict[str, Any], phrase_index: int) -> list[str]:
         if field not in phrase:
             errors.append(f"[{phrase_id}] Missing required field: {field}")
 
+    if "id" in phrase and not (
+        isinstance(phrase["id"], str) and PHRASE_ID_PATTERN.fullmatch(phrase["id"])
+    ):
+        errors.append(
+            f"[{phrase_id}] Invalid id: must be lowercase letters, digits and hyphens"
+        )
+
     if "meaning" in phrase:
         for lang in REQUIRED_MEANING_FIELDS:
             if lang not in phrase["meaning"]:
@@ -86,10 +109,14 @@ def validate_phrase(phrase: dict[str, Any], phrase_index: int) -> list[str]:
         elif len(phrase["tags"]) == 0:
             errors.append(f"[{phrase_id}] 'tags' must have at least one entry")
 
+    errors.extend(validate_media(phrase, media_dir))
+
     return errors
 
 
-def validate_phrase_file(file_path: Path, data: dict[str, Any]) -> list[str]:
+def validate_phrase_file(
+    file_path: Path, data: dict[str, Any], media_dir: Path | None = None
+) -> list[str]:
     """Validate a phrase YAML file."""
     errors = []
 
@@ -103,7 +130,7 @@ def validate_phrase_file(file_path: Path, data: dict[str, Any]) -> list[str]:
 
     seen_ids = set()
     for i, phrase in enumerate(data["phrases"]):
-        phrase_errors = validate_phrase(phrase, i)
+        phrase_errors = validate_phrase(phrase, i, media_dir)
         errors.extend(phrase_errors)
 
         phrase_id = phrase.get("id")
@@ -115,62 +142,113 @@ def validate_phrase_file(file_path: Path, data: dict[str, Any]) -> list[str]:
     return errors
 
 
-def validate_all(phrases_dir: Path) -> tuple[int, int]:
-    """Validate all YAML files in the phrases directory."""
-    total_errors = 0
-    total_files = 0
+def check_corpus_ids(data: dict[str, Any], location: str, known_ids: dict[str, str]) -> list[str]:
+    """Report ids already used in another file, and record this file's ids.
+
+    ``known_ids`` maps each id to the file it was first seen in.
+    """
+    errors = []
+    phrases = data.get("phrases") if isinstance(data, dict) else None
 
-    for category_dir in phrases_dir.iterdir():
-        if not category_dir.is_dir():
+    for phrase in phrases if isinstance(phrases, list) else []:
+        phrase_id = phrase.get("id") if isinstance(phrase, dict) else None
+        if not isinstance(phrase_id, str):
             continue
+        first = known_ids.setdefault(phrase_id, location)
+        if first != location:
+            errors.append(f"[{phrase_id}] Duplicate phrase ID (also in {first})")
+
+    return errors
 
-        print(f"\nCategory: {category_dir.name}")
 
-        for yaml_file in category_dir.glob("*.yaml"):
-            total_files += 1
-            print(f"  Validating: {yaml_file.name}")
+def validate_all(phrases_dir: Path, media_dir: Path | None = None) -> tuple[int, int]:
+    """Validate all YAML files in the phrases directory, its subcategories and shards.
 
-            data = load_yaml(yaml_file)
-            if data is None:
-                total_errors += 1
-                continue
+    Top-level directories without _category.yaml, and _category.yaml files
+    inside a shard, are errors: the build tools would skip them.
+    """
+    total_errors = 0
+    yaml_files = []
+    known_ids: dict[str, str] = {}
+
+    def reject(path: Path, message: str) -> None:
+        nonlocal total_errors
+        location = path.relative_to(phrases_dir).as_posix()
+        console.error(f"  ERROR: {location}: {message}", file=str(path), error=message)
+        total_errors += 1
+
+    for category in corpus.scan_categories(phrases_dir, on_skip=reject):
+        yaml_files.append((category.slug, category.meta_file.name, category.meta_file))
+        yaml_files.extend(
+            (category.slug, category.file_name(yaml_file), yaml_file)
+            for yaml_file in category.files
+        )
+
+    for slug, name, yaml_file in console.progress(yaml_files, len(yaml_files), "Validating"):
+        if console.verbose:
+            console.detail(f"  Validating: {slug}/{name}", file=str(yaml_file))
+
+        data = load_yaml(yaml_file)
+        if data is None:
+            total_errors += 1
+            continue
 
-            if yaml_file.name == "_category.yaml":
-                errors = validate_category(yaml_file, data)
-            else:
-                errors = validate_phrase_file(yaml_file, data)
+        if yaml_file.name == corpus.CATEGORY_FILE:
+            errors = validate_category(yaml_file, data)
+        else:
+            errors = validate_phrase_file(yaml_file, data, media_dir)
+            errors += check_corpus_ids(data, f"{slug}/{name}", known_ids)
 
-            if errors:
-                for error in errors:
-                    print(f"    ERROR: {error}")
-                total_errors += len(errors)
-            else:
-                print("    OK")
+        if errors:
+            for error in errors:
+                console.error(
+                    f"  ERROR: {slug}/{name}: {error}",
+                    file=str(yaml_file),
+                    error=error,
+                )
+            total_errors += len(errors)
+        elif console.verbose:
+            console.detail("    OK", file=str(yaml_file))
 
-    return total_files, total_errors
+    return len(yaml_files), total_errors
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Main entry point."""
     script_dir = Path(__file__).parent
-    phrases_dir = script_dir.parent / "phrases"
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--phrases-dir",
+        type=Path,
+        default=script_dir.parent / "phrases",
+        help="directory containing the phrase categories",
+    )
+    parser.add_argument(
+        "--media-dir",
+        type=Path,
+        default=script_dir.parent / "media",
+        help="directory that phrase media references are relative to",
+    )
+    console_options.add_arguments(parser)
+    args = parser.parse_args(argv)
+    console_options.configure(args)
+    phrases_dir = args.phrases_dir
 
     if not phrases_dir.exists():
-        print(f"ERROR: Phrases directory not found: {phrases_dir}")
+        console.error(f"ERROR: Phrases directory not found: {phrases_dir}")
         return 1
 
-    print("Validating phrase files...")
-    total_files, total_errors = validate_all(phrases_dir)
+    console.info("Validating phrase files...")
+    total_files, total_errors = validate_all(phrases_dir, args.media_dir)
 
-    print(f"\n{'=' * 40}")
-    print(f"Files validated: {total_files}")
-    print(f"Errors found: {total_errors}")
+    console.summary({"Files validated": total_files, "Errors found": total_errors})
 
     if total_errors > 0:
-        print("\nValidation FAILED")
+        console.error("\nValidation FAILED")
         return 1
 
-    print("\nValidation PASSED")
+    console.info("\nValidation PASSED")
     return 0
 
 